@@ -0,0 +1,53 @@
+import threading
+import time
+from collections import OrderedDict
+
+# Width of the profile buckets: players within the same band get the same tactics
+JUMP_BAND = 10
+ACCURACY_BAND = 10.0
+
+
+def profile_bucket(profile):
+    """Maps a player profile onto its (jump band, accuracy band) cache key."""
+    jumps = max(0, int(profile.get("jumps", 0)))
+    accuracy = min(100.0, max(0.0, float(profile.get("accuracy_percent", 0))))
+    return jumps // JUMP_BAND, min(int(accuracy // ACCURACY_BAND), int(100 // ACCURACY_BAND) - 1)
+
+
+class TacticsCache:
+    """
+    LRU + TTL cache of parsed tactics, keyed on the bucketed player profile.
+    Lookups and inserts both happen on the game thread: request_tactics() reads it, and
+    apply_pending() stores tactics once the boss accepts them off the result deque.
+    """
+
+    def __init__(self, max_entries=64, ttl=600.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict() # key -> (expires_at, tactics)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[0] < now:
+                if entry is not None:
+                    del self.entries[key] # Expired
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry[1])
+
+    def put(self, key, tactics):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, dict(tactics))
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
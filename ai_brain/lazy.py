@@ -0,0 +1,57 @@
+import importlib
+import threading
+
+
+class LazyTacticalBrain:
+    """
+    Stands in for AITacticalBrain without importing it. The orchestrator pulls in
+    requests and asyncio, which cost more at startup than everything the first
+    stage needs, and the AI only speaks after Stage 2.
+
+    warm_up() builds the real brain on a background thread ahead of time; if it was
+    never called, the first request_tactics() builds it in place.
+    """
+
+    def __init__(self, **options):
+        self.options = options
+        self.brain = None
+        self._thread = None
+
+    def warm_up(self):
+        if self.brain is None and self._thread is None:
+            self._thread = threading.Thread(target=self._build, daemon=True, name="ai-warm-up")
+            self._thread.start()
+
+    def _build(self):
+        orchestrator = importlib.import_module("ai_brain.orchestrator")
+        self.brain = orchestrator.AITacticalBrain(**self.options)
+
+    def _get(self):
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self.brain is None:
+            self._build()
+        return self.brain
+
+    # --- AITacticalBrain API ---
+
+    def request_tactics(self, player_profile):
+        self._get().request_tactics(player_profile)
+
+    def apply_pending(self, dragon_instance):
+        if self.brain is not None: # Nothing can be pending before the first request
+            self.brain.apply_pending(dragon_instance)
+
+    def cancel_pending(self):
+        if self.brain is not None:
+            self.brain.cancel_pending()
+
+    def stats(self):
+        return self._get().stats()
+
+    def close(self):
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        if self.brain is not None:
+            self.brain.close()
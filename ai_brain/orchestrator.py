@@ -1,43 +1,271 @@
+import asyncio
 import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 import json
-import re
+from requests.adapters import HTTPAdapter
+
+from ai_brain.cache import TacticsCache, profile_bucket
+
+OLLAMA_URL = "http://localhost:11434/api/generate"
+
+
+class JsonObjectScanner:
+    """
+    Finds the first flat {...} object in text that arrives in pieces.
+    Same match as re.search(r'\\{.*?\\}'), but it answers as soon as the closing brace streams in.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.start = -1
+
+    def feed(self, fragment):
+        """Adds streamed text. Returns the object's source once it is closed, else None."""
+        scan_from = len(self.text)
+        self.text += fragment
+        if self.start < 0:
+            self.start = self.text.find("{", scan_from)
+            if self.start < 0:
+                return None
+            scan_from = self.start
+        end = self.text.find("}", scan_from)
+        if end < 0:
+            return None
+        return self.text[self.start:end + 1]
+
 
 class AITacticalBrain:
-    def __init__(self, model_name="phi3"):
-        self.url = "http://localhost:11434/api/generate"
+    """
+    Talks to the local LLM from one long-lived background asyncio loop.
+    The game thread queues requests and collects results with apply_pending();
+    the boss is never touched from another thread.
+    """
+
+    def __init__(self, model_name="phi3", connect_timeout=2.0, read_timeout=30.0, deadline=20.0, url=OLLAMA_URL):
+        self.url = url
         self.model = model_name
-        self.is_calculating = False
+        self.deadline = deadline # Seconds a request may take before it is abandoned
+
+        # One keep-alive connection pool for every request to the Ollama server
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.timeout = (connect_timeout, read_timeout) # A hung model can't pin the worker forever
 
-    def request_tactics_async(self, player_profile, dragon_instance):
-        """Spawns a thread so the game doesn't stutter."""
-        if self.is_calculating:
+        self.cache = TacticsCache()
+        self.requests_sent = 0
+        self.request_errors = 0
+        self.parse_failures = 0 # Replies that arrived but held no usable JSON object
+        self.deadline_misses = 0
+        self.cancelled = 0
+        self.latencies = deque(maxlen=100) # Seconds from request to parsed tactics
+
+        # Handoff to the game thread: the loop appends, the game pops. deque appends and
+        # pops are atomic, so neither side ever waits on a lock.
+        self.results = deque()
+        self.generation = 0 # Bumped on restart; anything tagged older is stale
+
+        self._loop = None
+        self._queue = None
+        self._thread = None
+        self._http = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai-http")
+        self._inflight = None # Streaming response being read, so cancel can close it
+
+    # --- GAME THREAD API ---
+
+    def request_tactics(self, player_profile):
+        """Queues a tactics request. A cached answer for this kind of player is ready next frame."""
+        bucket = profile_bucket(player_profile)
+        cached = self.cache.get(bucket)
+        if cached is not None:
+            self.results.append((self.generation, bucket, cached))
             return
-        self.is_calculating = True
-        threading.Thread(target=self._fetch_and_parse, args=(player_profile, dragon_instance)).start()
 
-    def _fetch_and_parse(self, profile, dragon_instance):
+        self._start()
+        deadline = time.monotonic() + self.deadline
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, (self.generation, bucket, player_profile, deadline))
+
+    def apply_pending(self, dragon_instance):
+        """Called once per frame on the game thread. Hands finished tactics to the boss."""
+        while self.results:
+            generation, bucket, tactics = self.results.popleft()
+            if generation != self.generation:
+                continue # Finished after a restart
+            if dragon_instance.update_tactics(tactics): # Logged by the boss; no stdout on the game thread
+                self.cache.put(bucket, tactics) # Only remember tactics the boss accepted
+
+    def cancel_pending(self):
+        """Drops every queued or in-flight request, e.g. when the player restarts."""
+        self.generation += 1
+        self.results.clear()
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._abort_inflight)
+
+    def stats(self):
+        """Counters for monitoring the brain's cache and network health."""
+        latencies = list(self.latencies)
+        return {
+            "cache_hits": self.cache.hits,
+            "cache_misses": self.cache.misses,
+            "cache_entries": len(self.cache),
+            "requests": self.requests_sent,
+            "errors": self.request_errors,
+            "parse_failures": self.parse_failures,
+            "deadline_misses": self.deadline_misses,
+            "cancelled": self.cancelled,
+            "last_latency_ms": latencies[-1] * 1000 if latencies else None,
+            "mean_latency_ms": sum(latencies) / len(latencies) * 1000 if latencies else None,
+        }
+
+    # --- OFFLINE TOOLS ---
+
+    def fetch_tactics(self, player_profile):
+        """
+        Asks the model and blocks until it answers, for offline tools such as the tactics
+        table builder; never call it from the game thread. Gives up after the same deadline
+        as queued requests. Returns the parsed reply, or None if it was unusable or late;
+        network errors are raised as requests exceptions.
+        """
+        deadline = time.monotonic() + self.deadline
+        abandoned = threading.Event()
+        timer = threading.Timer(self.deadline, self._give_up, (abandoned,))
+        timer.daemon = True
+        timer.start()
+        try:
+            return self._fetch_and_parse(player_profile, self.generation, deadline, abandoned)
+        finally:
+            timer.cancel()
+
+    def close(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._abort_inflight)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=1.0)
+        self._http.shutdown(wait=False)
+        self.session.close()
+
+    # --- BACKGROUND LOOP ---
+
+    def _start(self):
+        if self._thread is not None:
+            return
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run_loop, args=(ready,), daemon=True, name="ai-brain")
+        self._thread.start()
+        ready.wait()
+
+    def _run_loop(self, ready):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._queue = asyncio.Queue()
+        serve = self._loop.create_task(self._serve())
+        ready.set()
+        self._loop.run_forever()
+
+        # close() stopped the loop: let the serve task unwind before the loop goes away
+        serve.cancel()
+        self._loop.run_until_complete(asyncio.gather(serve, return_exceptions=True))
+        self._loop.close()
+
+    async def _serve(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            generation, bucket, profile, deadline = await self._queue.get()
+            remaining = deadline - time.monotonic()
+            if generation != self.generation or remaining <= 0:
+                self.cancelled += 1
+                continue
+
+            start = time.perf_counter()
+            abandoned = threading.Event()
+            try:
+                tactics = await asyncio.wait_for(
+                    loop.run_in_executor(self._http, self._fetch_and_parse, profile, generation, deadline, abandoned),
+                    remaining)
+            except asyncio.TimeoutError:
+                self._give_up(abandoned)
+                print(f"[AI ERROR] No tactics within {self.deadline:.1f}s. Keeping current weights.")
+                continue
+            except Exception as e:
+                self.request_errors += 1
+                print(f"[NETWORK ERROR] Local LLM unreachable: {e}")
+                continue
+
+            if tactics is None:
+                continue
+            self.latencies.append(time.perf_counter() - start)
+            self.results.append((generation, bucket, tactics))
+
+    def _give_up(self, abandoned):
+        """The deadline passed: the request's reply, whenever it comes, is dropped."""
+        self.deadline_misses += 1
+        abandoned.set() # The HTTP thread may still be inside post(); it drops the reply when it gets out
+        self._abort_inflight()
+
+    def _abort_inflight(self):
+        response = self._inflight
+        if response is not None:
+            self.cancelled += 1
+            response.close() # Unblocks the HTTP thread's read
+
+    def _fetch_and_parse(self, profile, generation, deadline, abandoned):
+        """
+        Runs on the HTTP thread. Streams the reply and stops reading once the JSON closes.
+        Socket timeouts never outlast the deadline, so an abandoned request can't hold up
+        the ones queued behind it.
+        """
         prompt = f"""
         You are a game AI. Player data: {profile}.
         Output ONLY a JSON dictionary assigning tactical weights (1-10) to these attacks:
         "fire_blast", "spike_drop", "earthquake".
         Example: {{"projectiles": 8, "spike_drop": 2, "earthquake": 4}}
         """
-        
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or abandoned.is_set():
+            return None
+        connect_timeout, read_timeout = self.timeout
+        self.requests_sent += 1
+        scanner = JsonObjectScanner()
+        response = self.session.post(self.url, json={"model": self.model, "prompt": prompt, "stream": True},
+                                     timeout=(min(connect_timeout, remaining), min(read_timeout, remaining)),
+                                     stream=True)
+        if abandoned.is_set():
+            response.close() # The deadline passed while post() was blocked
+            return None
+        self._inflight = response
+        if response.status_code != 200:
+            self._inflight = None
+            response.close()
+            raise requests.HTTPError(f"HTTP {response.status_code} from {self.url}")
         try:
-            response = requests.post(self.url, json={"model": self.model, "prompt": prompt, "stream": False})
-            raw_text = response.json().get("response", "")
-            
-            match = re.search(r'\{.*?\}', raw_text, re.DOTALL)
-            if match:
-                tactics = json.loads(match.group(0))
-                dragon_instance.update_tactics(tactics)
-                print(f"[AI DM] New Tactics Deployed: {tactics}")
-            else:
-                print("[AI ERROR] Failed to parse JSON. Falling back to default.")
-                
-        except Exception as e:
-            print(f"[NETWORK ERROR] Local LLM unreachable: {e}")
-            
+            for line in response.iter_lines():
+                if generation != self.generation or abandoned.is_set():
+                    return None # Restarted or past the deadline while streaming
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                found = scanner.feed(chunk.get("response", ""))
+                if found is not None:
+                    return json.loads(found)
+                if chunk.get("done"):
+                    break
+        except ValueError as e:
+            self.parse_failures += 1
+            print(f"[AI ERROR] Failed to parse JSON ({e}). Falling back to default.")
+            return None
+        except Exception:
+            if generation != self.generation or abandoned.is_set():
+                return None # Our own cancel closed the socket mid-read
+            raise
         finally:
-            self.is_calculating = False
\ No newline at end of file
+            self._inflight = None
+            response.close()
+
+        self.parse_failures += 1
+        print("[AI ERROR] Failed to parse JSON. Falling back to default.")
+        return None
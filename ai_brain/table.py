@@ -0,0 +1,129 @@
+"""
+Precomputed Dragon tactics, one weight vector per player-profile bucket.
+
+The table is built offline and memory-mapped at startup, so the world can hand the
+Dragon tuned weights the moment Stage 2 is cleared, before the LLM has answered (or
+when it never does). The model's reply replaces the entry later.
+
+File layout (little-endian): a header, then jump_bands x accuracy_bands entries in
+row-major order (jump band outer), each one byte per attack in KEYS order.
+
+Build it (optionally asking the local model for every bucket instead of the rules):
+    python -m ai_brain.table build [OUT] [--from-llm]
+"""
+import mmap
+import struct
+import sys
+
+from ai_brain.cache import JUMP_BAND, ACCURACY_BAND, profile_bucket
+
+MAGIC = b"TACT"
+VERSION = 1
+HEADER = struct.Struct("<4sHBBBB")  # magic, version, jump bands, accuracy bands, jump band width, accuracy band width
+KEYS = ("projectiles", "spike_drop", "earthquake")
+ENTRY = struct.Struct("<" + "B" * len(KEYS))
+
+DEFAULT_TABLE = "ai_brain/tactics.tbl"
+JUMP_BANDS = 10 # Everyone past the last band shares its row
+ACCURACY_BANDS = int(100 // ACCURACY_BAND)
+
+
+def rule_tactics(jump_band, accuracy_band, jump_bands=JUMP_BANDS, accuracy_bands=ACCURACY_BANDS):
+    """
+    Rule-of-thumb weights (1-10) for a bucket. Earthquakes only hurt grounded players, so
+    they fade as the jump count rises; jumpy players get spike drops instead, and sharp
+    shooters get more fire to keep them moving.
+    """
+    jump = jump_band / max(1, jump_bands - 1)
+    aim = accuracy_band / max(1, accuracy_bands - 1)
+    return {
+        "projectiles": round(2 + 8 * aim),
+        "spike_drop": round(2 + 8 * jump),
+        "earthquake": round(10 - 9 * jump),
+    }
+
+
+def write_table(path, source=rule_tactics, jump_bands=JUMP_BANDS, accuracy_bands=ACCURACY_BANDS):
+    """Writes source(jump_band, accuracy_band) for every bucket. Weights are clamped to 1-10."""
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, jump_bands, accuracy_bands, JUMP_BAND, int(ACCURACY_BAND)))
+        for jump_band in range(jump_bands):
+            for accuracy_band in range(accuracy_bands):
+                tactics = source(jump_band, accuracy_band)
+                f.write(ENTRY.pack(*(min(10, max(1, int(tactics[key]))) for key in KEYS)))
+
+
+class TacticsTable:
+    """Read-only view of a tactics file. lookup() is a couple of byte reads, no parsing."""
+
+    def __init__(self, path=DEFAULT_TABLE):
+        self.path = path
+        self._file = open(path, "rb")
+        self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.jump_bands, self.accuracy_bands, jump_width, accuracy_width = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} tactics table")
+        if (jump_width, accuracy_width) != (JUMP_BAND, int(ACCURACY_BAND)):
+            self.close()
+            raise ValueError(f"{path} was built for different profile buckets; rebuild it")
+        if len(self.data) < HEADER.size + self.jump_bands * self.accuracy_bands * ENTRY.size:
+            self.close()
+            raise ValueError(f"{path} is truncated")
+
+    @classmethod
+    def load(cls, path=DEFAULT_TABLE):
+        """The table at `path`, or None (with a note) if there isn't a usable one."""
+        try:
+            return cls(path)
+        except (OSError, ValueError, struct.error) as e:
+            print(f"[SYSTEM] No tactics table ({e}). The Dragon waits for the AI brain.")
+            return None
+
+    def lookup(self, player_profile):
+        """Tactics for the profile's bucket, as a fresh dict."""
+        jump_band, accuracy_band = profile_bucket(player_profile)
+        jump_band = min(jump_band, self.jump_bands - 1)
+        accuracy_band = min(accuracy_band, self.accuracy_bands - 1)
+        offset = HEADER.size + (jump_band * self.accuracy_bands + accuracy_band) * ENTRY.size
+        return dict(zip(KEYS, ENTRY.unpack_from(self.data, offset)))
+
+    def close(self):
+        self.data.close()
+        self._file.close()
+
+
+def llm_tactics(jump_band, accuracy_band, brain=None):
+    """Asks the local model about a player in the middle of the bucket; falls back to the rules."""
+    import requests
+    profile = {"jumps": jump_band * JUMP_BAND + JUMP_BAND // 2,
+               "accuracy_percent": accuracy_band * ACCURACY_BAND + ACCURACY_BAND / 2}
+    try:
+        tactics = brain.fetch_tactics(profile)
+    except requests.RequestException as e:
+        print(f"[NETWORK ERROR] Bucket {jump_band},{accuracy_band}: {e}")
+        return rule_tactics(jump_band, accuracy_band)
+    if tactics is not None and all(key in tactics for key in KEYS):
+        try:
+            return {key: int(float(tactics[key])) for key in KEYS}
+        except (TypeError, ValueError) as e:
+            print(f"[AI ERROR] Bucket {jump_band},{accuracy_band}: unusable weights ({e})")
+    return rule_tactics(jump_band, accuracy_band)
+
+
+def main(argv):
+    if not argv or argv[0] != "build":
+        sys.exit("usage: python -m ai_brain.table build [OUT] [--from-llm]")
+    paths = [arg for arg in argv[1:] if not arg.startswith("--")]
+    path = paths[0] if paths else DEFAULT_TABLE
+    source = rule_tactics
+    if "--from-llm" in argv:
+        from ai_brain.orchestrator import AITacticalBrain
+        brain = AITacticalBrain()
+        source = lambda jump_band, accuracy_band: llm_tactics(jump_band, accuracy_band, brain)
+    write_table(path, source)
+    print(f"[SYSTEM] Wrote {JUMP_BANDS}x{ACCURACY_BANDS} tactics table to {path}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
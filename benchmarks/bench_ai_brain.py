@@ -0,0 +1,172 @@
+"""
+The AI brain against the local Ollama stub (tools.ollama_stub) under fast, slow,
+flaky and malformed model replies. For each scenario: time from request_tactics()
+to tactics reaching the Dragon (p50/p99), how often a request ends with nothing
+usable and why, and how much game-loop frame time a request in flight costs.
+
+The stub runs in its own process so its threads don't compete for this one's GIL.
+The game loop is a headless World plus a pure-Python stand-in for rendering, paced
+at 60 Hz; frames are split into "idle" and "in flight" by whether a request is open.
+
+    python -m benchmarks.bench_ai_brain
+    python -m benchmarks.bench_ai_brain --scenario flaky --requests 50
+"""
+import argparse
+import contextlib
+import io
+import multiprocessing
+import os
+import random
+import socket
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from ai_brain.cache import TacticsCache
+from ai_brain.orchestrator import AITacticalBrain
+from core.engine import World, FrameInput
+from entities.dragon_ai import DragonBoss
+from tools.ollama_stub import StubConfig, serve
+
+SCENARIOS = {
+    "fast": dict(latency="fixed:50"),
+    "typical": dict(latency="lognormal:400,0.6"),
+    "slow": dict(latency="lognormal:1200,0.5"),
+    "flaky": dict(latency="lognormal:400,0.6", rates={"error": 0.15, "truncated": 0.15}),
+    "malformed": dict(latency="lognormal:400,0.6", rates={"wrong_keys": 0.2, "prose": 0.2, "nested": 0.1}),
+}
+FRAME = 1 / 60
+IDLE_FRAMES = 10 # Quiet frames between requests, which double as the idle baseline
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def percentile(values, p):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, len(ordered) * p // 100)]
+
+
+def spin(ms):
+    """Holds the GIL for `ms`, like the renderer's Python-side work does."""
+    end = time.perf_counter() + ms / 1000
+    while time.perf_counter() < end:
+        pass
+
+
+class CountingDragon(DragonBoss):
+    """Tallies the tactics the boss accepts and rejects."""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.outcomes = {"accepted": 0, "rejected": 0}
+
+    def update_tactics(self, new_tactics):
+        accepted = super().update_tactics(new_tactics)
+        self.outcomes["accepted" if accepted else "rejected"] += 1
+        return accepted
+
+
+def run_scenario(name, spec, requests, render_ms, deadline, seed):
+    port = free_port()
+    ready = multiprocessing.Event()
+    config = StubConfig(spec["latency"], rates=spec.get("rates"), seed=seed)
+    server = multiprocessing.Process(target=serve, args=(config, "127.0.0.1", port, ready), daemon=True)
+    server.start()
+    ready.wait()
+
+    brain = AITacticalBrain(deadline=deadline, url=f"http://127.0.0.1:{port}/api/generate")
+    brain.cache = TacticsCache(ttl=-1) # Every request goes to the model
+    dragon = CountingDragon(0, 0, random.Random(seed))
+    outcomes = dragon.outcomes
+
+    world = World(1366, 768, seed=seed)
+    rng = random.Random(seed)
+    idle, in_flight, time_to_tactics = [], [], []
+    sent = 0
+    open_since = None
+    quiet = IDLE_FRAMES
+    settled = 0
+
+    with contextlib.redirect_stdout(io.StringIO()): # The brain reports errors on stdout
+        next_frame = time.perf_counter()
+        while sent < requests or open_since is not None:
+            start = time.perf_counter()
+            world.player.hp = 100
+            world.step(FrameInput(right=True, fire=world.frame % 6 == 0))
+            spin(render_ms)
+            brain.apply_pending(dragon)
+            work = time.perf_counter() - start
+            (idle if open_since is None else in_flight).append(work * 1000)
+
+            done = (outcomes["accepted"] + outcomes["rejected"] + brain.request_errors
+                    + brain.deadline_misses + brain.parse_failures)
+            if open_since is not None and done > settled:
+                settled = done
+                if outcomes["accepted"] > len(time_to_tactics):
+                    time_to_tactics.append((time.perf_counter() - open_since) * 1000)
+                open_since = None
+                quiet = IDLE_FRAMES
+            elif open_since is None and sent < requests:
+                quiet -= 1
+                if quiet <= 0:
+                    brain.request_tactics({"jumps": rng.randint(0, 99), "accuracy_percent": rng.uniform(0, 100)})
+                    open_since = time.perf_counter()
+                    sent += 1
+
+            next_frame += FRAME
+            delay = next_frame - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_frame = time.perf_counter()
+
+    stats = brain.stats()
+    brain.close()
+    server.terminate()
+    server.join()
+
+    idle_mean = sum(idle) / len(idle)
+    flight_mean = sum(in_flight) / len(in_flight) if in_flight else idle_mean
+    return {
+        "scenario": name,
+        "requests": sent,
+        "p50": percentile(time_to_tactics, 50),
+        "p99": percentile(time_to_tactics, 99),
+        "usable": outcomes["accepted"] / sent * 100,
+        "parse_fail": stats["parse_failures"] / sent * 100,
+        "rejected": outcomes["rejected"] / sent * 100,
+        "errors": (stats["errors"] + stats["deadline_misses"]) / sent * 100,
+        "idle_p99": percentile(idle, 99),
+        "flight_p99": percentile(in_flight, 99),
+        "lost": flight_mean - idle_mean,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the AI brain against the Ollama stub")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), action="append", help="repeatable; default all")
+    parser.add_argument("--requests", type=int, default=20, help="requests per scenario")
+    parser.add_argument("--render-ms", type=float, default=4.0, help="Python-side render work per frame")
+    parser.add_argument("--deadline", type=float, default=5.0, help="brain's per-request deadline, seconds")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    columns = ("scenario", "requests", "p50 ms", "p99 ms", "usable %", "parse %", "reject %", "error %",
+               "idle p99", "flight p99", "lost ms/f")
+    print("".join(f"{c:>11}" for c in columns))
+    for name in args.scenario or SCENARIOS:
+        r = run_scenario(name, SCENARIOS[name], args.requests, args.render_ms, args.deadline, args.seed)
+        print(f"{r['scenario']:>11}{r['requests']:>11}{r['p50']:>11.0f}{r['p99']:>11.0f}{r['usable']:>11.1f}"
+              f"{r['parse_fail']:>11.1f}{r['rejected']:>11.1f}{r['errors']:>11.1f}"
+              f"{r['idle_p99']:>11.2f}{r['flight_p99']:>11.2f}{r['lost']:>11.3f}")
+    print("Time to tactics counts accepted replies only; frame columns are per-frame work in ms.")
+
+
+if __name__ == "__main__":
+    main()
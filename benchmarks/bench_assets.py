@@ -0,0 +1,79 @@
+"""
+Sprite loading at startup: per-file decode + scale (the old path) vs the atlas
+pipeline, cold (no cache) and warm (cache file from a previous launch).
+
+    python -m benchmarks.bench_assets
+"""
+import os
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from core.assets import ASSET_DIR, SpriteSpec, load_sprites
+
+SPECS = [
+    SpriteSpec("player", "mc.png", (70, 90), flip=True),
+    SpriteSpec("boss", "boss.png", (450, 350), flip=False),
+    SpriteSpec("earth_boss", "boss2.png", (450, 450), flip=False),
+    SpriteSpec("dragon_boss", "dragonboss.png", (700, 600), flip=False),
+    SpriteSpec("spike", "spike.png", None, flip=False),
+]
+RUNS = 5
+
+
+def legacy():
+    sprites = {}
+    for spec in SPECS:
+        image = pygame.image.load(os.path.join(ASSET_DIR, spec.filename)).convert_alpha()
+        sprites[spec.name] = pygame.transform.scale(image, spec.size) if spec.size else image
+    return sprites
+
+
+def timed(fn):
+    best = float("inf")
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    pygame.init()
+    pygame.display.set_mode((1920, 1080))
+    resolution = (1920, 1080)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        def cold():
+            for name in os.listdir(cache_dir):
+                os.remove(os.path.join(cache_dir, name))
+            return load_sprites(SPECS, resolution, cache_dir=cache_dir)
+
+        def warm():
+            return load_sprites(SPECS, resolution, cache_dir=cache_dir)
+
+        # The cached atlas must hold the exact pixels the old path produced
+        old, new = legacy(), warm()
+        for name, surface in old.items():
+            assert pygame.image.tostring(surface, "RGBA") == pygame.image.tostring(new[name], "RGBA"), name
+
+        print(f"{'legacy decode+scale':>22} {timed(legacy):8.1f} ms")
+        print(f"{'atlas, cold cache':>22} {timed(cold):8.1f} ms")
+        print(f"{'atlas, warm cache':>22} {timed(warm):8.1f} ms")
+        size = sum(os.path.getsize(os.path.join(cache_dir, name)) for name in os.listdir(cache_dir))
+        print(f"{'cache file':>22} {size / (1024 * 1024):8.1f} MB")
+
+    # Facing left used to flip (and allocate) a new surface every frame
+    image = old["player"]
+    flips = time.perf_counter()
+    for _ in range(600):
+        pygame.transform.flip(image, True, False)
+    flips = (time.perf_counter() - flips) / 600 * 1e6
+    print(f"{'per-frame flip (old)':>22} {flips:8.1f} us, now 0 (pre-flipped)")
+
+
+if __name__ == "__main__":
+    main()
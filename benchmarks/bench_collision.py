@@ -0,0 +1,59 @@
+"""
+Player.move collision cost: linear scan over every platform vs the PlatformIndex broadphase.
+
+    python -m benchmarks.bench_collision
+"""
+import random
+import timeit
+
+import pygame
+
+from core.engine import FrameInput
+from core.spatial import PlatformIndex
+from entities.player import Player
+
+FLOOR_Y = 970
+SIZES = [25, 1000, 50000]
+FRAMES = 600
+
+
+def make_platforms(count, seed=0):
+    """A long strip with the same spacing and shapes as the shipped stage."""
+    rng = random.Random(seed)
+    platforms = []
+    x = 0
+    for _ in range(count):
+        width = rng.randint(120, 1500)
+        y = rng.choice([FLOOR_Y, FLOOR_Y - 150, FLOOR_Y - 300, FLOOR_Y - 450])
+        platforms.append(pygame.Rect(x, y, width, 150 if width > 300 else 50))
+        x += width + rng.randint(60, 200)
+    return platforms
+
+
+def run(platforms, index=None):
+    # Drop the player in the middle of the level so the linear scan can't get lucky
+    mid = platforms[len(platforms) // 2]
+    player = Player(mid.x + 10, mid.y - 120)
+    inputs = FrameInput(right=True)
+    for frame in range(FRAMES):
+        inputs.jump = frame % 45 == 0
+        nearby = index.near(player.rect, player.speed) if index else platforms
+        player.move(nearby, inputs)
+    return player.rect.copy()
+
+
+def main():
+    print(f"{'platforms':>10} {'linear ms/frame':>16} {'index ms/frame':>15} {'speedup':>8}")
+    for count in SIZES:
+        platforms = make_platforms(count)
+        index = PlatformIndex(platforms) # Built once at level load, not per frame
+        # Both paths must land the player on the exact same pixel
+        assert run(platforms) == run(platforms, index)
+
+        linear = min(timeit.repeat(lambda: run(platforms), number=1, repeat=3)) / FRAMES * 1000
+        indexed = min(timeit.repeat(lambda: run(platforms, index), number=1, repeat=3)) / FRAMES * 1000
+        print(f"{count:>10} {linear:>16.4f} {indexed:>15.4f} {linear / indexed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Projectile update + collision: the old list of Projectile objects vs ProjectilePool.
+A boss sprays bullets at the player every frame until the live count hits the target.
+
+    python -m benchmarks.bench_projectiles
+"""
+import time
+
+import pygame
+
+from core.projectiles import ProjectilePool
+
+COUNTS = [10, 1000, 5000, 20000]
+FRAMES = 300
+
+
+class Actor:
+    def __init__(self, x, y, width, height, hp):
+        self.rect = pygame.Rect(x, y, width, height)
+        self.hp = hp
+
+
+class LegacyProjectile:
+    """The old per-object projectile, kept here only as the baseline."""
+    def __init__(self, x, y, speed, is_player, color, width=15, height=15):
+        self.rect = pygame.Rect(x, y, width, height)
+        self.speed = speed
+        self.is_player = is_player
+        self.color = color
+
+
+def legacy_update(projectiles, player, targets):
+    for proj in projectiles[:]:
+        proj.rect.x += proj.speed
+        if proj.rect.x > player.rect.x + 800 or proj.rect.x < player.rect.x - 800:
+            projectiles.remove(proj)
+            continue
+        if proj.is_player:
+            for b in targets:
+                if b.hp > 0 and proj.rect.colliderect(b.rect):
+                    b.hp -= 1
+                    projectiles.remove(proj)
+                    break
+        else:
+            if proj.rect.colliderect(player.rect):
+                player.hp -= 10
+                projectiles.remove(proj)
+
+
+def spray(spawn, frame, per_frame):
+    for i in range(per_frame):
+        spawn(1500, 100 + (frame * 37 + i * 53) % 800, -8 - i % 5, False, (169, 169, 169))
+        spawn(1000, 100 + (frame * 11 + i * 29) % 800, 15, True, (255, 100, 0))
+
+
+def run(count, use_pool):
+    player = Actor(900, 600, 70, 90, 10 ** 9)
+    targets = [Actor(1400, 0, 450, 350, 10 ** 9)]
+    # Bullets live ~70 frames, so this rate keeps roughly `count` of them in flight
+    per_frame = max(1, count // 140)
+    if use_pool:
+        pool = ProjectilePool(capacity=count * 2)
+        spawn, update = pool.spawn, lambda: pool.update(player, targets)
+    else:
+        projectiles = []
+        spawn = lambda *args: projectiles.append(LegacyProjectile(*args))
+        update = lambda: legacy_update(projectiles, player, targets)
+
+    worst = 0
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        frame_start = time.perf_counter()
+        spray(spawn, frame, per_frame)
+        update()
+        worst = max(worst, time.perf_counter() - frame_start)
+    mean = (time.perf_counter() - start) / FRAMES
+    live = pool.count if use_pool else len(projectiles)
+    return mean * 1000, worst * 1000, live
+
+
+def main():
+    print(f"{'target':>7} {'live':>6} {'list ms':>8} {'worst':>7} {'pool ms':>8} {'worst':>7}")
+    for count in COUNTS:
+        list_ms, list_worst, live = run(count, False)
+        pool_ms, pool_worst, _ = run(count, True)
+        print(f"{count:>7} {live:>6} {list_ms:>8.3f} {list_worst:>7.2f} {pool_ms:>8.3f} {pool_worst:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+"""
+Microbenchmarks for the frame loop's hot paths, with stored baselines.
+
+Each benchmark times one frame's worth of a subsystem (Player.move, the projectile
+pool, the spike list, each boss, the Dragon's dice roll, 60 World.steps and a
+full render) in a steady state, so calls are comparable. Scaled variants (10x and
+100x spikes, 100x projectiles) show how cost grows, not just where it stands today.
+
+    python -m benchmarks.suite                                # run and print
+    python -m benchmarks.suite --save baseline.json           # record a baseline
+    python -m benchmarks.suite --compare baseline.json --threshold 10
+    python -m benchmarks.suite --filter projectiles
+
+--compare exits with status 1 if any benchmark got slower than the baseline by more
+than the threshold (percent). It compares the fastest timed batch of each, which
+background load disturbs far less than the median. Baselines only mean something on
+the machine that recorded them, and a busy or frequency-scaling machine moves every
+benchmark at once: if everything shifts together, rerun on a quiet machine before
+believing it.
+
+Needs no display: SDL runs on its dummy video driver.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from core.assets import SpriteSpec, load_sprites
+from core.background import TiledBackground
+from core.engine import World, FrameInput
+from core.level import STAGE1_SPIKES
+from core.snapshot import capture, restore
+from core.render import RenderQueue, draw_world
+from entities.enemies import Spike
+
+WIDTH, HEIGHT = 1366, 768
+BASE_PROJECTILES = 30 # About what a busy boss fight keeps in flight
+FORMAT = 1
+
+
+def make_world():
+    with contextlib.redirect_stdout(io.StringIO()):
+        return World(WIDTH, HEIGHT, seed=1)
+
+
+def place(world, x):
+    """Moves the player and camera to world x and streams that part of the level in."""
+    player = world.player
+    player.rect.x = x
+    player.rect.bottom = world.floor_y
+    world.true_scroll = x - WIDTH // 2
+    world.camera_scroll = max(0, int(world.true_scroll))
+    world.stream_level()
+
+
+def fill_pool(pool, count, player, target):
+    """
+    `count` parked projectiles (speed 0) around the player: half the player's shots
+    short of the target, half the boss's shots short of the player. Nothing moves,
+    despawns or hits, so every call does the same full-array work.
+    """
+    pool.clear()
+    rng = random.Random(count)
+    for i in range(count):
+        if i % 2:
+            x = rng.randrange(player.rect.right + 20, target.rect.left - 20)
+            pool.spawn(x, rng.randrange(100, HEIGHT - 100), 0, True, (255, 100, 0), source="player")
+        else:
+            x = rng.randrange(player.rect.right + 20, target.rect.left - 20)
+            pool.spawn(x, rng.randrange(100, HEIGHT - 100), 0, False, (169, 169, 169), source="boss_volley")
+
+
+# --- BENCHMARKS: each factory sets up a scene and returns one frame's worth of work (or N frames, "xN") ---
+
+def bench_player_move(scale):
+    world = make_world()
+    place(world, 600)
+    player = world.player
+    index = world.platform_index
+    inputs = FrameInput(right=True)
+    start = player.rect.topleft
+
+    def run():
+        player.rect.topleft = start
+        player.vel_y = 0
+        player.move(index.near(player.rect, player.speed), inputs)
+    return run
+
+
+def bench_projectiles(scale):
+    world = make_world()
+    place(world, 3000)
+    pool = world.projectiles
+    fill_pool(pool, BASE_PROJECTILES * scale, world.player, world.boss)
+    player = world.player
+    bosses = world.bosses
+
+    def run():
+        pool.update(player, bosses)
+    return run
+
+
+def bench_spikes(scale):
+    world = make_world()
+    player = world.player
+    place(world, 100)
+    # Copies of the stage's spikes, spread over the same stretch; the player stands clear of every tripwire
+    spikes = []
+    for copy in range(scale):
+        for x, y in STAGE1_SPIKES:
+            spikes.append(Spike(x + copy * 7, y))
+
+    def run():
+        for spike in spikes:
+            spike.update(player)
+    return run
+
+
+def bench_boss(name):
+    def factory(scale):
+        world = make_world()
+        boss = getattr(world, name)
+        place(world, boss.rect.x - 500)
+        player = world.player
+        pool = world.projectiles
+        dropped = []
+        player.hp = 10 ** 9
+
+        if name == "boss":
+            def run():
+                boss.update(player, pool)
+                pool.clear()
+        elif name == "earth_boss":
+            def run():
+                boss.update(player)
+        else:
+            def run():
+                boss.update(player, pool, dropped)
+                pool.clear()
+                dropped.clear()
+        return run
+    return factory
+
+
+def bench_choose_attack(scale):
+    world = make_world()
+    dragon = world.dragon_boss
+    dragon.tactics = {"projectiles": 8, "spike_drop": 2, "earthquake": 4}
+    return dragon.choose_attack
+
+
+def bench_world_step(scale):
+    """The same 60 frames every call: restored from a snapshot, so the fight never drifts."""
+    world = make_world()
+    place(world, 7000) # Earth boss in range, spikes and platforms resident
+    world.player.hp = 10 ** 6
+    start = capture(world)
+    inputs = [FrameInput(fire=i % 6 == 0, jump=i % 30 == 0) for i in range(60)]
+
+    def run():
+        restore(world, start)
+        for step_inputs in inputs:
+            world.step(step_inputs)
+    return run
+
+
+def bench_render(scale):
+    """One frame through main.py's own draw_world() at full render scale: backdrop, sprites, projectiles, spikes."""
+    world = make_world()
+    place(world, 2700)
+    screen = pygame.display.get_surface()
+    player = world.player
+    boss = world.boss
+    fill_pool(world.projectiles, BASE_PROJECTILES * scale, player, boss)
+    background = TiledBackground(pygame.image.load(os.path.join("assets", "bg.jpg")), world.level_width, HEIGHT, WIDTH)
+    images = load_sprites([
+        SpriteSpec("player", "mc.png", player.rect.size, flip=True),
+        SpriteSpec("boss", "boss.png", boss.rect.size, flip=False),
+        SpriteSpec("spike", "spike.png", None, flip=False),
+    ], (WIDTH, HEIGHT))
+    queue = RenderQueue()
+
+    def run():
+        draw_world(screen, queue, world, background, images)
+    return run
+
+
+# name -> (factory, scale)
+BENCHMARKS = {
+    "player.move": (bench_player_move, 1),
+    "projectiles.update": (bench_projectiles, 1),
+    "projectiles.update x100": (bench_projectiles, 100),
+    "spikes.update": (bench_spikes, 1),
+    "spikes.update x10": (bench_spikes, 10),
+    "spikes.update x100": (bench_spikes, 100),
+    "boss.update": (bench_boss("boss"), 1),
+    "earth_boss.update": (bench_boss("earth_boss"), 1),
+    "dragon_boss.update": (bench_boss("dragon_boss"), 1),
+    "dragon.choose_attack": (bench_choose_attack, 1),
+    "world.step x60": (bench_world_step, 1),
+    "render.frame": (bench_render, 1),
+    "render.frame x100 projectiles": (bench_render, 100),
+}
+
+
+def measure(run, repeats=7, min_time=0.02):
+    """Per-call seconds for each of `repeats` timed batches, batches sized to last >= min_time."""
+    warm_until = time.perf_counter() + min_time # Caches and CPU clocks settle before anything counts
+    while time.perf_counter() < warm_until:
+        run()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed < min_time / 4 else 1 + int(min_time / max(elapsed, 1e-9))
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        samples.append((time.perf_counter() - start) / number)
+    return samples, number
+
+
+def run_suite(names, repeats, min_time):
+    results = {}
+    for name in names:
+        factory, scale = BENCHMARKS[name]
+        samples, number = measure(factory(scale), repeats, min_time)
+        results[name] = {
+            "median_us": statistics.median(samples) * 1e6,
+            "min_us": min(samples) * 1e6,
+            "calls": number * repeats,
+        }
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Prints current vs baseline best times. Returns the names that regressed past the threshold."""
+    regressed = []
+    print(f"{'benchmark':<32}{'baseline us':>13}{'now us':>13}{'change':>10}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<32}{'-':>13}{result['min_us']:>13.2f}{'new':>10}")
+            continue
+        change = (result["min_us"] / base["min_us"] - 1) * 100
+        flag = ""
+        if change > threshold:
+            regressed.append(name)
+            flag = "  REGRESSED"
+        print(f"{name:<32}{base['min_us']:>13.2f}{result['min_us']:>13.2f}{change:>+9.1f}%{flag}")
+    for name in baseline:
+        if name not in BENCHMARKS:
+            print(f"{name:<32}{baseline[name]['min_us']:>13.2f}{'-':>13}{'gone':>10}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frame-loop microbenchmarks with stored baselines")
+    parser.add_argument("--filter", help="only benchmarks whose name contains this")
+    parser.add_argument("--save", metavar="FILE", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="FILE", help="compare against a JSON baseline; exit 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed slowdown in percent (default 10)")
+    parser.add_argument("--repeats", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.02, help="seconds per timed batch")
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((WIDTH, HEIGHT))
+
+    names = [name for name in BENCHMARKS if not args.filter or args.filter in name]
+    results = run_suite(names, args.repeats, args.min_time)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("format") != FORMAT:
+            sys.exit(f"{args.compare} is not a format {FORMAT} benchmark baseline")
+        regressed = compare(results, baseline["results"], args.threshold)
+    else:
+        print(f"{'benchmark':<32}{'median us':>12}{'min us':>12}{'calls':>9}")
+        for name, result in results.items():
+            print(f"{name:<32}{result['median_us']:>12.2f}{result['min_us']:>12.2f}{result['calls']:>9}")
+        regressed = []
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({
+                "format": FORMAT,
+                "recorded": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "python": platform.python_version(),
+                "pygame": pygame.version.ver,
+                "machine": platform.machine(),
+                "results": results,
+            }, f, indent=2)
+        print(f"[BENCH] Baseline written to {args.save}")
+
+    pygame.quit()
+    if regressed:
+        print(f"[BENCH] {len(regressed)} benchmark(s) regressed more than {args.threshold:g}%: {', '.join(regressed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+class SectorGrid:
+    """
+    Entity activation keyed on x-sectors.
+    Each entity is filed under the sectors its activation span covers; anything outside
+    the queried window stays asleep and costs nothing per frame, however long the level is.
+    Behaves like a list for the code that only appends, removes or iterates.
+    """
+
+    def __init__(self, sector_width=512, span=None):
+        self.sector_width = sector_width
+        # Activation span of an entity along x. Defaults to its own rect.
+        self.span = span or (lambda entity: (entity.rect.left, entity.rect.right))
+        self.sectors = {}
+        self.entries = {} # entity -> (insertion order, span start, span end)
+        self._next_seq = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(list(self.entries))
+
+    def __contains__(self, entity):
+        return entity in self.entries
+
+    def append(self, entity):
+        x0, x1 = self.span(entity)
+        self.entries[entity] = (self._next_seq, x0, x1)
+        self._next_seq += 1
+        for sector in range(x0 // self.sector_width, x1 // self.sector_width + 1):
+            self.sectors.setdefault(sector, []).append(entity)
+
+    def remove(self, entity):
+        _, x0, x1 = self.entries.pop(entity)
+        for sector in range(x0 // self.sector_width, x1 // self.sector_width + 1):
+            bucket = self.sectors[sector]
+            bucket.remove(entity)
+            if not bucket:
+                del self.sectors[sector]
+
+    def clear(self):
+        self.sectors.clear()
+        self.entries.clear()
+
+    def awake(self, left, right):
+        """
+        Entities whose span overlaps [left, right), in insertion order.
+        With left == right it is a point test: span start < x < span end.
+        """
+        entries = self.entries
+        sectors = self.sectors
+        first = left // self.sector_width
+        last = right // self.sector_width
+
+        found = []
+        if first == last:
+            for entity in sectors.get(first, ()):
+                _, x0, x1 = entries[entity]
+                if x0 < right and left < x1:
+                    found.append(entity)
+            return found
+
+        seen = set()
+        for sector in range(first, last + 1):
+            for entity in sectors.get(sector, ()):
+                if entity in seen:
+                    continue
+                seen.add(entity)
+                _, x0, x1 = entries[entity]
+                if x0 < right and left < x1:
+                    found.append(entity)
+        found.sort(key=lambda entity: entries[entity][0])
+        return found
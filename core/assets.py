@@ -0,0 +1,237 @@
+"""
+Sprite atlas pipeline.
+
+Every sprite is decoded, scaled to its entity size and (optionally) pre-flipped once,
+then packed into a single RGBA atlas. The atlas is written to a raw pixel cache keyed
+by display resolution, render scale and each source file's mtime, so later launches
+skip PNG decoding and scaling entirely and map the cache file in one go. Writing a
+group's atlas deletes its older builds, and the cache is capped in size besides.
+
+AssetLoader runs these loads on a worker thread so the game can draw a loading
+screen, and start playing, while later stages' assets are still decoding.
+"""
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import deque, namedtuple
+
+import pygame
+
+ASSET_DIR = "assets"
+CACHE_DIR = ".asset_cache"
+MAX_CACHE_BYTES = 32 * 1024 * 1024 # Every group at every render scale for one display, with room to spare
+
+MAGIC = b"ATLS"
+VERSION = 1
+HEADER = struct.Struct("<4sHHHH")   # magic, version, atlas width, atlas height, entry count
+ENTRY = struct.Struct("<24sHHHH")   # name, x, y, width, height
+
+# size=None keeps the image's native size; flip adds a mirrored "<name>_left" variant
+SpriteSpec = namedtuple("SpriteSpec", ["name", "filename", "size", "flip"])
+
+
+def _pack(sizes, max_width=2048):
+    """Shelf packer: tallest sprites first, left to right, wrapping into new shelves."""
+    order = sorted(range(len(sizes)), key=lambda i: sizes[i][1], reverse=True)
+    positions = [None] * len(sizes)
+    x = y = shelf_height = atlas_width = 0
+    for i in order:
+        w, h = sizes[i]
+        if x and x + w > max_width:
+            x, y = 0, y + shelf_height
+            shelf_height = 0
+        positions[i] = (x, y)
+        x += w
+        shelf_height = max(shelf_height, h)
+        atlas_width = max(atlas_width, x)
+    return positions, (atlas_width, y + shelf_height)
+
+
+def _cache_path(specs, resolution, scale, asset_dir, cache_dir):
+    """atlas_<group>_<resolution>@<scale>_<key>.bin: everything before the key names one group's slot."""
+    key = hashlib.sha1(repr((VERSION, resolution, scale)).encode())
+    for spec in specs:
+        path = os.path.join(asset_dir, spec.filename)
+        key.update(repr((spec, os.stat(path).st_mtime_ns)).encode())
+    width, height = resolution
+    group = "-".join(spec.name for spec in specs)
+    return os.path.join(cache_dir, f"atlas_{group}_{width}x{height}@{scale:g}_{key.hexdigest()[:16]}.bin")
+
+
+def _build(specs, scale, asset_dir):
+    """Decodes and scales every sprite. Returns (names, rects, atlas surface)."""
+    images = []
+    names = []
+    for spec in specs:
+        image = pygame.image.load(os.path.join(asset_dir, spec.filename))
+        size = spec.size or image.get_size()
+        size = (max(1, round(size[0] * scale)), max(1, round(size[1] * scale)))
+        image = pygame.transform.scale(image.convert_alpha(), size)
+        images.append(image)
+        names.append(spec.name)
+        if spec.flip:
+            images.append(pygame.transform.flip(image, True, False))
+            names.append(spec.name + "_left")
+
+    positions, atlas_size = _pack([image.get_size() for image in images])
+    atlas = pygame.Surface(atlas_size, pygame.SRCALPHA, 32)
+    rects = []
+    for image, pos in zip(images, positions):
+        # RGBA_MAX onto transparent black copies pixels exactly instead of alpha-blending them
+        atlas.blit(image, pos, special_flags=pygame.BLEND_RGBA_MAX)
+        rects.append(pygame.Rect(pos, image.get_size()))
+    return names, rects, atlas
+
+
+def _write(path, names, rects, atlas):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, atlas.get_width(), atlas.get_height(), len(names)))
+        for name, rect in zip(names, rects):
+            f.write(ENTRY.pack(name.encode(), rect.x, rect.y, rect.width, rect.height))
+        f.write(pygame.image.tostring(atlas, "RGBA"))
+    os.replace(tmp_path, path) # Never leave a half-written cache behind
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+        return True
+    except OSError:
+        return False # Open in another process; a later prune gets it
+
+
+def _prune(path, max_bytes=MAX_CACHE_BYTES):
+    """
+    Deletes the older builds of the atlas just written to `path` (same group, resolution
+    and scale), then the oldest other atlases until the cache fits in max_bytes.
+    """
+    cache_dir, name = os.path.split(path)
+    slot = name[:name.rindex("_") + 1]
+    total = os.path.getsize(path)
+    others = []
+    for entry in os.scandir(cache_dir):
+        if entry.path == path or not entry.name.endswith(".bin"):
+            continue # Skips another process's half-written .tmp
+        if entry.name.startswith(slot) or "@" not in entry.name: # Or named before atlases had slots
+            _remove(entry.path)
+        else:
+            stat = entry.stat()
+            others.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+    for _, size, other in sorted(others):
+        if total <= max_bytes:
+            break
+        if _remove(other):
+            total -= size
+
+
+def _read(path):
+    """Maps the cache file and uploads the pixels in one bulk conversion."""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        magic, version, width, height, count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} atlas")
+        names = []
+        rects = []
+        offset = HEADER.size
+        for _ in range(count):
+            name, x, y, w, h = ENTRY.unpack_from(data, offset)
+            names.append(name.rstrip(b"\0").decode())
+            rects.append(pygame.Rect(x, y, w, h))
+            offset += ENTRY.size
+        pixels = data[offset:offset + width * height * 4]
+    atlas = pygame.image.frombuffer(pixels, (width, height), "RGBA")
+    return names, rects, atlas
+
+
+def load_sprites(specs, resolution, scale=1.0, asset_dir=ASSET_DIR, cache_dir=CACHE_DIR):
+    """
+    Returns {name: Surface} for every spec (plus "<name>_left" for flipped ones).
+    All surfaces are subsurfaces of one display-format atlas.
+    """
+    path = _cache_path(specs, resolution, scale, asset_dir, cache_dir)
+    try:
+        names, rects, atlas = _read(path)
+    except (OSError, ValueError, struct.error):
+        names, rects, atlas = _build(specs, scale, asset_dir)
+        try:
+            _write(path, names, rects, atlas)
+            _prune(path)
+        except OSError as e:
+            print(f"[ASSETS] Could not write atlas cache: {e}")
+
+    atlas = atlas.convert_alpha()
+    return {name: atlas.subsurface(rect) for name, rect in zip(names, rects)}
+
+
+class AssetLoader:
+    """
+    Runs asset jobs one after another on a worker thread, in the order they were added.
+    Image decoding releases the GIL, so the game thread keeps drawing meanwhile.
+    Jobs may be added at any time; the worker sleeps when the queue is empty.
+    """
+
+    def __init__(self):
+        self.jobs = deque()     # (key, callable, args)
+        self.finished = deque() # (key, result, error) waiting for poll()
+        self.timings = {}       # key -> seconds the job took on the worker
+        self.done = set()
+        self.total = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def add(self, key, load, *args):
+        """Queues load(*args); its result comes back from poll() under `key`."""
+        with self._lock:
+            self.jobs.append((key, load, args))
+            self.total += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True, name="asset-loader")
+                self._thread.start()
+
+    def add_sprites(self, key, specs, resolution, scale=1.0, asset_dir=ASSET_DIR):
+        """Queues one sprite group; each group gets its own atlas (and atlas cache file)."""
+        self.add(key, load_sprites, specs, resolution, scale, asset_dir)
+
+    def poll(self):
+        """[(key, result)] for jobs finished since the last call. Re-raises a job's error here."""
+        ready = []
+        while self.finished:
+            key, result, error = self.finished.popleft()
+            self.done.add(key)
+            if error is not None:
+                raise error
+            ready.append((key, result))
+        return ready
+
+    def ready(self, *keys):
+        """True once poll() has handed back every one of these jobs."""
+        return all(key in self.done for key in keys)
+
+    @property
+    def progress(self):
+        return len(self.done) / self.total if self.total else 1.0
+
+    @property
+    def idle(self):
+        return self._thread is None and not self.finished
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self.jobs:
+                    self._thread = None # add() starts a fresh worker for the next job
+                    return
+                key, load, args = self.jobs.popleft()
+            start = time.perf_counter()
+            try:
+                result, error = load(*args), None
+            except Exception as e: # Surfaced on the game thread by poll()
+                result, error = None, e
+            self.timings[key] = time.perf_counter() - start
+            self.finished.append((key, result, error))
@@ -0,0 +1,116 @@
+import math
+from collections import OrderedDict
+
+import pygame
+
+
+class TiledBackground:
+    """
+    The level backdrop, cut into screen-width tiles that are scaled on demand.
+    Each tile is scaled from its own slice of the source image, and only the tiles
+    around the camera are kept in memory (LRU), so a longer level costs no extra
+    memory. Only the one or two tiles actually on screen get blitted each frame.
+    """
+
+    def __init__(self, image, level_width, height, tile_width, cache_size=3, band_width=256):
+        self.level_width = level_width
+        self.height = height
+        self.tile_width = tile_width
+        self.cache_size = cache_size
+        self.band_width = band_width
+        self.tile_count = -(-level_width // tile_width)
+        self.tiles = OrderedDict() # Evicted surfaces are recycled for the next tile
+        self.progress = {} # tile index -> first column not scaled yet
+        self.last_scroll = 0
+
+        # Tiles are scaled straight from the source, so memory depends on the source and the
+        # resident tiles, never on how long the level is
+        self.source = image
+        self.scale_x = image.get_width() / level_width # Source columns per level column
+
+    def scaled(self, scale):
+        """The same backdrop for a smaller render scale. Shares the source; only its own tiles cost memory."""
+        return TiledBackground(self.source, round(self.level_width * scale), round(self.height * scale),
+                               round(self.tile_width * scale), self.cache_size, self.band_width)
+
+    def release(self):
+        """Drops every scaled tile, e.g. while this view is not being drawn. They rebuild on demand."""
+        self.tiles.clear()
+        self.progress.clear()
+
+    def _surface(self, index):
+        tiles = self.tiles
+        surface = tiles.get(index)
+        if surface is not None:
+            tiles.move_to_end(index)
+            return surface
+
+        width = min(self.tile_width, self.level_width - index * self.tile_width)
+        surface = None
+        if len(tiles) >= self.cache_size:
+            evicted, surface = tiles.popitem(last=False) # Evict the tile furthest back in time
+            self.progress.pop(evicted, None)
+            if surface.get_width() != width:
+                surface = None
+        if surface is None:
+            surface = pygame.Surface((width, self.height)).convert()
+        tiles[index] = surface
+        self.progress[index] = 0
+        return surface
+
+    def _build(self, index, surface, bands=None):
+        """Scales up to `bands` column bands of a tile (all remaining ones if None)."""
+        x = self.progress.get(index)
+        if x is None:
+            return
+        width = surface.get_width()
+        tile_x = index * self.tile_width
+        while x < width and bands != 0:
+            band = min(self.band_width, width - x)
+            self._scale_band(tile_x + x, band, surface, x)
+            x += band
+            if bands is not None:
+                bands -= 1
+
+        if x >= width:
+            del self.progress[index]
+        else:
+            self.progress[index] = x
+
+    def _scale_band(self, level_x, band, surface, x):
+        """Scales the source columns behind level columns [level_x, level_x + band) into surface at x."""
+        source = self.source
+        source_width = source.get_width()
+        k = self.scale_x
+        # Whole source columns covering the band, plus one so rounding never leaves a gap
+        first = int(level_x * k)
+        last = min(source_width, math.ceil((level_x + band) * k) + 1)
+        scaled = pygame.transform.scale(source.subsurface((first, 0, last - first, source.get_height())),
+                                        (max(band, round((last - first) / k)), self.height))
+        # The same level-to-source mapping for every band, so neighbouring bands meet without seams
+        offset = min(round(level_x - first / k), scaled.get_width() - band)
+        surface.blit(scaled, (x, 0), (offset, 0, band, self.height))
+
+    def tile(self, index):
+        """Returns the fully scaled surface for tile `index`, finishing it first if needed."""
+        surface = self._surface(index)
+        self._build(index, surface)
+        return surface
+
+    def draw(self, screen, scroll_x, offset_y=0):
+        """Blits the tiles covering [scroll_x, scroll_x + screen width)."""
+        tile_width = self.tile_width
+        first = max(0, scroll_x // tile_width)
+        last = min(self.tile_count - 1, (scroll_x + screen.get_width() - 1) // tile_width)
+        for index in range(first, last + 1):
+            screen.blit(self.tile(index), (index * tile_width - scroll_x, offset_y))
+
+        # Spread the next tile's scaling over the frames it takes the camera to reach it,
+        # so crossing a tile boundary never costs a whole tile rebuild in one frame
+        if scroll_x < self.last_scroll:
+            ahead = first - 1
+        else:
+            ahead = last + 1 # Levels run left to right, so an idle camera looks ahead too
+        self.last_scroll = scroll_x
+        if 0 <= ahead < self.tile_count:
+            self._build(ahead, self._surface(ahead), bands=1)
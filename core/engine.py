@@ -0,0 +1,276 @@
+import random
+
+from entities.player import Player
+from entities.enemies import Boss, EarthBoss
+from entities.dragon_ai import DragonBoss
+from core.spatial import PlatformIndex
+from core.level import LevelStream, DEFAULT_LEVEL
+from core.projectiles import ProjectilePool
+from core.activation import SectorGrid
+from core.telemetry import frame_timer
+from core.events import event_log, SHOT, HIT, JUMP, RESTART, AI_HANDOFF
+from ai_brain.table import TacticsTable, DEFAULT_TABLE
+from core.snapshot import capture, restore
+
+
+class FrameInput:
+    """One frame of player input, decoupled from the keyboard so the world can run headless."""
+    __slots__ = ("left", "right", "jump", "jump_pressed", "fire", "restart")
+
+    def __init__(self, left=False, right=False, jump=False, jump_pressed=False, fire=False, restart=False):
+        self.left = left                  # Held keys
+        self.right = right
+        self.jump = jump
+        self.jump_pressed = jump_pressed  # Edge-triggered (KEYDOWN this frame)
+        self.fire = fire
+        self.restart = restart
+
+    def held(self):
+        """The same input with the edge-triggered presses removed, for catch-up steps."""
+        return FrameInput(self.left, self.right, self.jump, restart=self.restart)
+
+
+# Event-log names of the entries in World.bosses
+BOSS_NAMES = ("boss", "earth_boss", "dragon_boss")
+
+class World:
+    """
+    The whole game simulation with no rendering attached.
+    Owns the player, the three bosses and the stage, and advances one frame per step().
+    Needs no display, so it can run uncapped on headless machines.
+    The stage streams in from a chunked level file as the camera moves.
+    """
+
+    def __init__(self, width, height, ai_brain=None, seed=None, level_path=DEFAULT_LEVEL, tactics_path=DEFAULT_TABLE):
+        self.width = width
+        self.height = height
+        # Every random roll in the simulation comes from this one seeded generator
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.floor_y = height - 110
+        self.ai_brain = ai_brain # Optional: headless runs leave the LLM out
+        self.tactics_table = TacticsTable.load(tactics_path) # Instant tactics while the LLM thinks
+
+        self.level = LevelStream(level_path, self.floor_y)
+        self.level_width = self.level.level_width
+        spawns = self.level.bosses
+
+        self.player = Player(100, self.floor_y - 60)
+        self.boss = Boss(*spawns["boss"])
+        self.earth_boss = EarthBoss(*spawns["earth_boss"])
+        self.dragon_boss = DragonBoss(*spawns["dragon_boss"], self.rng)
+        self.bosses = [self.boss, self.earth_boss, self.dragon_boss]
+
+        # Bosses wake when the player enters their wake radius, hazards when they come near the screen
+        self.boss_sectors = SectorGrid(span=lambda b: (b.rect.x - b.wake_radius, b.rect.x + b.wake_radius))
+        for b in self.bosses:
+            self.boss_sectors.append(b)
+
+        self.platforms = []
+        self.platform_index = PlatformIndex(self.platforms)
+        self.spikes = SectorGrid()
+        self.falling_spikes = [] # Once a spike drops it stays awake until it leaves the screen
+        self.projectiles = ProjectilePool()
+
+        self.player_profile = {
+            "total_jumps": 0,
+            "shots_fired": 0,
+            "shots_hit": 0
+        }
+
+        self.true_scroll = 0
+        self.camera_scroll = 0
+        self.shake_x = 0
+        self.shake_y = 0
+        self.ai_triggered = False
+        self.frame = 0
+        # Where things stood before the latest step, so the renderer can interpolate
+        self.prev_player_pos = self.player.rect.topleft
+        self.prev_camera_scroll = 0
+        self.stream_level()
+
+        # Restarts restore snapshots: the latest stage checkpoint, else the world as built
+        self.checkpoints = {} # stage name -> snapshot
+        self.checkpoint = None
+        self.history = None   # Optional SnapshotRing of recent steps, for rewinding while debugging
+        self.start_state = capture(self)
+
+    def step(self, inputs):
+        """Advances the simulation by exactly one frame."""
+        player = self.player
+        boss = self.boss
+        earth_boss = self.earth_boss
+        dragon_boss = self.dragon_boss
+        projectiles = self.projectiles
+        profile = self.player_profile
+        self.prev_player_pos = player.rect.topleft
+        self.prev_camera_scroll = self.camera_scroll
+        event_log.tick(self.frame)
+
+        # --- 1. INPUT EVENTS ---
+        if player.hp > 0:
+            if inputs.fire:
+                direction = 15 if player.facing_right else -15
+                projectiles.spawn(player.rect.centerx, player.rect.centery, direction, True, (255, 100, 0), source="player")
+                profile["shots_fired"] += 1
+                event_log.log(SHOT, "player", player.rect.centerx, player.rect.centery, direction)
+
+            if inputs.jump_pressed and not player.is_jumping:
+                profile["total_jumps"] += 1
+                event_log.log(JUMP, "player", player.rect.x, player.rect.y)
+
+        # --- 2. CAMERA ---
+        self.true_scroll += (player.rect.x - (self.width // 2) - self.true_scroll) / 10
+        self.camera_scroll = max(0, int(self.true_scroll))
+        self.stream_level()
+
+        # --- 3. AI HANDOFF ---
+        # Normally on clearing Stage 2; a player who runs past the Earth boss gets profiled
+        # as the Dragon wakes, so the fight never starts on its untuned defaults
+        if not self.ai_triggered and (earth_boss.hp <= 0 or abs(player.rect.x - dragon_boss.rect.x) <= dragon_boss.wake_radius):
+            self.trigger_ai()
+        if self.ai_brain is not None:
+            self.ai_brain.apply_pending(dragon_boss) # Tactics only ever change on this thread
+
+        # --- 4. PHYSICS ---
+        with frame_timer.scope("physics"):
+            if player.hp > 0:
+                player.move(self.platform_index.near(player.rect, player.speed), inputs)
+            else:
+                player.vel_y += 0.8
+                player.rect.y += player.vel_y
+
+        # --- 5. BOSS AI ---
+        with frame_timer.scope("boss_ai"):
+            awake_bosses = self.boss_sectors.awake(player.rect.x, player.rect.x)
+            if boss.hp > 0 and boss in awake_bosses:
+                boss.update(player, projectiles)
+
+            if earth_boss.hp > 0 and earth_boss in awake_bosses:
+                earth_boss.update(player)
+
+            if dragon_boss in awake_bosses:
+                dragon_boss.update(player, projectiles, self.spikes)
+
+            if player.hp > 0:
+                for b in self.bosses:
+                    if b.hp > 0 and player.rect.colliderect(b.rect):
+                        player.take_damage(2, "contact")
+
+                        if player.rect.centerx < b.rect.centerx:
+                            player.rect.x -= 30
+                        else:
+                            player.rect.x += 30
+
+                        player.vel_y = -8
+
+        # --- 6. PROJECTILES ---
+        with frame_timer.scope("projectiles"):
+            target_hits, player_hits = projectiles.update(player, self.bosses)
+            profile["shots_hit"] += sum(target_hits)
+            for name, b, hits in zip(BOSS_NAMES, self.bosses, target_hits):
+                if hits:
+                    event_log.log(HIT, name, hits, b.hp)
+            for source, hits in player_hits.items():
+                player.take_damage(10 * hits, source)
+
+        # --- 7. HAZARDS ---
+        with frame_timer.scope("spikes"):
+            self.stream_level() # The player may have respawned since the camera moved
+            awake_spikes = self.spikes.awake(*self.hazard_window())
+            falling = self.falling_spikes
+            for spike in falling:
+                if spike not in awake_spikes:
+                    awake_spikes.append(spike)
+
+            for spike in awake_spikes:
+                was_falling = spike.falling
+                spike.update(player)
+                if spike.rect.y > self.height:
+                    self.spikes.remove(spike)
+                    self.level.mark_spent(spike)
+                    if was_falling:
+                        falling.remove(spike)
+                elif spike.falling and not was_falling:
+                    falling.append(spike)
+
+        # --- 8. CAMERA SHAKE ---
+        self.shake_x = 0
+        self.shake_y = 0
+        if earth_boss.hp > 0 and earth_boss.is_charging:
+            self.shake_x = self.rng.randint(-12, 12)
+            self.shake_y = self.rng.randint(-12, 12)
+
+        # Dragon Boss Earthquake Camera Link
+        if dragon_boss.hp > 0 and dragon_boss.is_shaking:
+            self.shake_x = self.rng.randint(-20, 20)
+            self.shake_y = self.rng.randint(-20, 20)
+
+        # --- 9. CHECKPOINTS & RESTART ---
+        for name, b in zip(BOSS_NAMES, self.bosses):
+            if b is not dragon_boss and b.hp <= 0 and name not in self.checkpoints:
+                self.save_checkpoint(name)
+        if player.hp <= 0 and inputs.restart:
+            self.restart()
+
+        self.frame += 1
+        if self.history is not None:
+            self.history.push(capture(self))
+
+    def stream_level(self):
+        """Pulls in the level chunks around the hazard window and drops the ones left far behind."""
+        changes = self.level.update(*self.hazard_window())
+        if changes is None:
+            return
+        added, evicted = changes
+        for spike in evicted:
+            if spike in self.spikes:
+                self.spikes.remove(spike)
+                if spike in self.falling_spikes:
+                    self.falling_spikes.remove(spike)
+        for spike in added:
+            self.spikes.append(spike)
+        # A handful of resident platforms: rebuilding the index is cheaper than patching it
+        self.platforms = self.level.platform_rects()
+        self.platform_index = PlatformIndex(self.platforms)
+
+    def hazard_window(self):
+        """World x-range where hazards are awake: the screen plus the player's tripwire reach."""
+        rect = self.player.rect
+        left = min(self.camera_scroll, rect.left) - 150
+        right = max(self.camera_scroll + self.width, rect.right) + 150
+        return left, right
+
+    def trigger_ai(self):
+        """Tunes the Dragon to the player's telemetry: from the tactics table now, from the AI brain once it answers."""
+        profile = self.player_profile
+        accuracy = 0
+        if profile["shots_fired"] > 0:
+            accuracy = round((profile["shots_hit"] / profile["shots_fired"]) * 100, 2)
+
+        final_profile = {
+            "jumps": profile["total_jumps"],
+            "accuracy_percent": accuracy
+        }
+        event_log.log(AI_HANDOFF, "player", final_profile["jumps"], round(accuracy * 100))
+
+        if self.tactics_table is not None:
+            self.dragon_boss.update_tactics(self.tactics_table.lookup(final_profile)) # The LLM's reply refines it
+        if self.ai_brain is not None:
+            self.ai_brain.request_tactics(final_profile)
+        self.ai_triggered = True
+
+    def restart(self):
+        """Back to the latest stage checkpoint (or the very start), exactly as the world was then."""
+        event_log.log(RESTART, "player")
+        frame = self.frame
+        restore(self, self.checkpoint or self.start_state)
+        self.frame = frame # The step counter is a clock for logs and replays; it keeps running
+        self.player.hp = 100 # A checkpoint brings back the stage, not the wounds
+        # Forget any reply still on its way; a restored trigger asks again
+        if self.ai_brain is not None:
+            self.ai_brain.cancel_pending()
+
+    def save_checkpoint(self, name):
+        """Snapshots the world as the restart point, e.g. when a stage's boss falls."""
+        self.checkpoint = self.checkpoints[name] = capture(self)
@@ -0,0 +1,233 @@
+"""
+Gameplay event log.
+
+The game thread packs fixed-size records into preallocated buffers; a background
+writer thread appends full buffers to disk in batches and rotates files by size.
+Logging never waits on the disk: if the writer falls behind and every buffer is
+still queued, new events are counted as dropped instead.
+
+File layout (little-endian): a header, then records. Names of attacks, bosses and
+damage sources are written once per file as NAME records, ahead of the first
+record that refers to them.
+
+Summarize a log:
+    python -m core.events logs/events_20240101_120000_0.evl
+"""
+import os
+import struct
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+MAGIC = b"EVLG"
+VERSION = 1
+HEADER = struct.Struct("<4sHd")     # magic, version, unix time the file was opened
+RECORD = struct.Struct("<IBBiii")   # frame, event type, subject name id, a, b, c
+
+# Event types and what their fields hold. Append only, never reorder.
+SHOT = 0         # subject: shooter          a, b: x, y   c: direction
+HIT = 1          # subject: boss hit          a: hits      b: hp left
+JUMP = 2         # subject: player            a, b: x, y
+BOSS_ATTACK = 3  # subject: attack            a, b: boss x, y
+DAMAGE = 4       # subject: damage source     a: amount    b: hp left
+DEATH = 5        # subject: player            a, b: x, y
+RESTART = 6      # subject: player
+TACTICS = 7      # subject: accepted/rejected a, b, c: projectiles, spike_drop, earthquake weights
+RENDER_SCALE = 8 # subject: renderer          a: scale in percent  b: frame time in 1/100 ms
+AI_HANDOFF = 9   # subject: player            a: jumps     b: accuracy in 1/100 percent
+NAME = 255       # subject: id being named    a: byte length of the UTF-8 name that follows
+
+EVENT_NAMES = {SHOT: "shot", HIT: "hit", JUMP: "jump", BOSS_ATTACK: "boss_attack", DAMAGE: "damage",
+               DEATH: "death", RESTART: "restart", TACTICS: "tactics", RENDER_SCALE: "render_scale",
+               AI_HANDOFF: "ai_handoff"}
+
+
+class EventLog:
+    """
+    Disabled until open(); until then log() returns straight away, so headless runs
+    and benchmarks pay one attribute check per event.
+    """
+
+    def __init__(self, buffer_records=4096, buffer_count=4, max_file_bytes=8 * 1024 * 1024, flush_frames=30):
+        self.enabled = False
+        self.frame = 0 # Stamped on every record; the world sets it each step
+        self.buffer_records = buffer_records
+        self.max_file_bytes = max_file_bytes
+        self.flush_frames = flush_frames # Partial buffers go to the writer at least this often
+
+        self.names = []    # id -> name. Append only, so the writer can read it without a lock
+        self.name_ids = {}
+        self.dropped = 0
+        self.written = 0
+
+        # Buffers cycle free -> active -> full -> free. Handoffs go through deques,
+        # whose appends and pops are atomic, so the game thread never takes a lock.
+        self._free = deque(bytearray(RECORD.size * buffer_records) for _ in range(buffer_count))
+        self._full = deque()
+        self._active = None
+        self._used = 0
+        self._last_handoff = 0
+
+        self.directory = None
+        self._wake = threading.Event()
+        self._stop = False
+        self._thread = None
+
+    # --- GAME THREAD ---
+
+    def open(self, directory="logs"):
+        """Starts logging to rotating files in `directory`."""
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._active = self._free.popleft()
+        self._used = 0
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, daemon=True, name="event-writer")
+        self._thread.start()
+        self.enabled = True
+
+    def name_id(self, name):
+        """Small integer id for an attack, boss or damage-source name."""
+        name_id = self.name_ids.get(name)
+        if name_id is None:
+            name_id = self.name_ids[name] = len(self.names)
+            self.names.append(name)
+        return name_id
+
+    def log(self, event, subject, a=0, b=0, c=0):
+        if not self.enabled:
+            return
+        buffer = self._active
+        if buffer is None:
+            buffer = self._active = self._take_buffer()
+            if buffer is None:
+                self.dropped += 1
+                return
+        RECORD.pack_into(buffer, self._used * RECORD.size, self.frame, event, self.name_id(subject), a, b, c)
+        self._used += 1
+        if self._used == self.buffer_records:
+            self._hand_off()
+
+    def tick(self, frame):
+        """Called once per simulation step: stamps the frame and ships partial buffers now and then."""
+        self.frame = frame
+        if self.enabled and self._used and frame - self._last_handoff >= self.flush_frames:
+            self._hand_off()
+
+    def close(self):
+        """Flushes what is left and stops the writer (waits briefly, never forever)."""
+        if not self.enabled:
+            return
+        self.enabled = False
+        if self._used:
+            self._hand_off()
+        self._stop = True
+        self._wake.set()
+        self._thread.join(timeout=2.0)
+
+    def _take_buffer(self):
+        try:
+            return self._free.popleft()
+        except IndexError:
+            return None # Writer is behind on every buffer
+
+    def _hand_off(self):
+        self._full.append((self._active, self._used))
+        self._last_handoff = self.frame
+        self._active = self._take_buffer()
+        self._used = 0
+        self._wake.set()
+
+    # --- WRITER THREAD ---
+
+    def _new_file(self):
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        index = 0
+        while True:
+            path = os.path.join(self.directory, f"events_{stamp}_{index}.evl")
+            if not os.path.exists(path):
+                break
+            index += 1
+        f = open(path, "ab")
+        f.write(HEADER.pack(MAGIC, VERSION, time.time()))
+        return f
+
+    def _run(self):
+        f = self._new_file()
+        size = HEADER.size
+        named = 0 # Names already written to the current file
+        try:
+            while True:
+                self._wake.wait(0.5)
+                self._wake.clear()
+                while self._full:
+                    buffer, used = self._full.popleft()
+                    chunks = []
+                    names = self.names
+                    while named < len(names): # Every id in this batch was named before it was logged
+                        encoded = names[named].encode()
+                        chunks.append(RECORD.pack(0, NAME, named, len(encoded), 0, 0) + encoded)
+                        named += 1
+                    chunks.append(bytes(memoryview(buffer)[:used * RECORD.size]))
+                    self._free.append(buffer) # Copied out: the game can refill it while we write
+
+                    data = b"".join(chunks)
+                    f.write(data)
+                    size += len(data)
+                    self.written += used
+                    if size >= self.max_file_bytes:
+                        f.close()
+                        f = self._new_file()
+                        size = HEADER.size
+                        named = 0
+                f.flush()
+                if self._stop and not self._full:
+                    break
+        finally:
+            f.close()
+
+
+def read_events(path):
+    """Yields (frame, event name, subject name, a, b, c) from one log file."""
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, _ = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} event log")
+    names = {}
+    offset = HEADER.size
+    while offset + RECORD.size <= len(data):
+        frame, event, subject, a, b, c = RECORD.unpack_from(data, offset)
+        offset += RECORD.size
+        if event == NAME:
+            names[subject] = data[offset:offset + a].decode()
+            offset += a
+            continue
+        yield frame, EVENT_NAMES.get(event, str(event)), names.get(subject, str(subject)), a, b, c
+
+
+def main(path):
+    counts = Counter()
+    damage = Counter()
+    last_frame = 0
+    for frame, event, subject, a, b, c in read_events(path):
+        counts[(event, subject)] += 1
+        if event == "damage":
+            damage[subject] += a
+        last_frame = frame
+    print(f"[EVENTS] {sum(counts.values())} events up to frame {last_frame}")
+    for (event, subject), count in sorted(counts.items()):
+        print(f"  {event:<13}{subject:<16}{count:>8}")
+    if damage:
+        print("[EVENTS] Damage taken by source: " + ", ".join(f"{s} {d}" for s, d in damage.most_common()))
+
+
+# Shared by the world, the entities and the AI glue, like a logger
+event_log = EventLog()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("usage: python -m core.events FILE")
+    main(sys.argv[1])
@@ -0,0 +1,271 @@
+"""
+Chunked binary level format and the streaming loader.
+
+Layout (little-endian):
+    header      magic "LEVL", version, chunk width, level width, chunk count, boss count
+    bosses      kind, x, y offset from the floor
+    chunk index one (offset, platform count, spike count) per chunk
+    chunk data  platform records, then spike records
+
+A platform is stored in every chunk its x-extent touches (with a level-wide id for
+de-duplication); a spike lives in the chunk holding its left edge. Platform y can be
+anchored to the floor, which depends on the screen height, so one file fits every
+resolution.
+
+Rebuild the shipped stage from its literal definition:
+    python -m core.level convert [levels/stage1.lvl]
+"""
+import mmap
+import os
+import struct
+import sys
+
+import pygame
+
+from entities.enemies import Spike
+
+DEFAULT_LEVEL = os.path.join("levels", "stage1.lvl")
+
+MAGIC = b"LEVL"
+VERSION = 1
+HEADER = struct.Struct("<4sHIIIH")     # magic, version, chunk width, level width, chunks, bosses
+BOSS = struct.Struct("<Bii")           # kind, x, y offset from floor
+CHUNK = struct.Struct("<IHH")          # data offset, platforms, spikes
+PLATFORM = struct.Struct("<IiiHHB")    # id, x, y, width, height, floor-anchored
+SPIKE = struct.Struct("<Iii")          # id, x, y
+
+BOSS_KINDS = ("boss", "earth_boss", "dragon_boss")
+
+# --- THE HAND-AUTHORED STAGE ---
+# FLOOR marks a platform sitting on the floor line (screen height - 110)
+FLOOR = None
+
+STAGE1_WIDTH = 15000
+
+STAGE1_PLATFORMS = [
+    (0, FLOOR, 649, 150),
+    (805, FLOOR, 327, 150),
+    (1300, FLOOR, 958, 150),
+    (2426, FLOOR, 650, 150),
+    (3173, FLOOR, 1564, 150),
+    (4857, 652, 4216, 150),
+    (7802, 455, 120, 50),
+    (7989, 383, 120, 50),
+    (7886, 229, 120, 50),
+    (9157, 500, 321, 150),
+    (9518, 690, 120, 50),
+    (9687, 565, 120, 50),
+    (9853, 501, 398, 150),
+    (10357, 596, 218, 150),
+    (10687, 639, 400, 150),
+    (11219, 526, 796, 150),
+    (12128, 530, 410, 150),
+    (12628, 317, 183, 50),
+    (12923, 528, 657, 150),
+    (13584, 379, 180, 50),
+    (13845, 475, 180, 50),
+    (13664, 636, 180, 50),
+    (14061, 618, 940, 150)
+]
+
+STAGE1_SPIKES = [
+    (4887, 85),
+    (5129, 65),
+    (5364, 50),
+    (5433, 70),
+    (5633, 94),
+    (5942, 70),
+    (6365, 78),
+    (6135, 62),
+    (6642, 49),
+    (6840, 56),
+    (7094, 83),
+    (7415, 68),
+    (7585, 60),
+    (7843, 82),
+    (7642, 79),
+    (8120, 51)
+]
+
+# (kind, x, y offset from the floor)
+STAGE1_BOSSES = [
+    ("boss", 4122, -350),
+    ("earth_boss", 8100, -550),
+    ("dragon_boss", 14080, -700)
+]
+
+
+def write_level(path, platforms, spikes, bosses, level_width, chunk_width=1024):
+    """Serializes literal level data (in the STAGE1_* shapes above) into a chunked file."""
+    chunk_count = max(1, -(-level_width // chunk_width))
+    chunk_platforms = [[] for _ in range(chunk_count)]
+    chunk_spikes = [[] for _ in range(chunk_count)]
+
+    for pid, (x, y, w, h) in enumerate(platforms):
+        record = PLATFORM.pack(pid, x, 0 if y is FLOOR else y, w, h, y is FLOOR)
+        first = max(0, x // chunk_width)
+        last = min(chunk_count - 1, (x + w - 1) // chunk_width)
+        for chunk in range(first, last + 1):
+            chunk_platforms[chunk].append(record)
+
+    for sid, (x, y) in enumerate(spikes):
+        chunk = min(chunk_count - 1, max(0, x // chunk_width))
+        chunk_spikes[chunk].append(SPIKE.pack(sid, x, y))
+
+    head = HEADER.pack(MAGIC, VERSION, chunk_width, level_width, chunk_count, len(bosses))
+    head += b"".join(BOSS.pack(BOSS_KINDS.index(kind), x, y) for kind, x, y in bosses)
+
+    offset = len(head) + CHUNK.size * chunk_count
+    index = []
+    blobs = []
+    for plats, spks in zip(chunk_platforms, chunk_spikes):
+        blob = b"".join(plats) + b"".join(spks)
+        index.append(CHUNK.pack(offset, len(plats), len(spks)))
+        blobs.append(blob)
+        offset += len(blob)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(head)
+        f.write(b"".join(index))
+        f.write(b"".join(blobs))
+
+
+class LevelStream:
+    """
+    Memory-maps a level file and keeps only the chunks around the camera resident.
+    Platforms are handed out as pygame.Rects in level order; spikes become Spike
+    entities, and spikes that already fell stay gone when their chunk streams back in.
+    """
+
+    def __init__(self, path, floor_y, margin=1, keep=2):
+        self.floor_y = floor_y
+        self.margin = margin # Chunks loaded beyond the visible window on each side
+        self.keep = keep     # Extra chunks kept before eviction, so edge jitter doesn't thrash
+
+        self._file = open(path, "rb")
+        self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.chunk_width, self.level_width, self.chunk_count, boss_count = HEADER.unpack_from(self.data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} level file")
+
+        offset = HEADER.size
+        self.bosses = {}
+        for _ in range(boss_count):
+            kind, x, y = BOSS.unpack_from(self.data, offset)
+            self.bosses[BOSS_KINDS[kind]] = (x, floor_y + y)
+            offset += BOSS.size
+        self.index = [CHUNK.unpack_from(self.data, offset + i * CHUNK.size) for i in range(self.chunk_count)]
+
+        self.chunks = {}      # chunk -> (platform ids, spikes)
+        self.platforms = {}   # platform id -> (Rect, number of loaded chunks holding it)
+        self.spike_ids = {}   # Spike -> level id
+        self.spent = set()    # Ids of spikes that already fell out of the level
+        self.window = None
+
+    def _read_chunk(self, chunk):
+        offset, platform_count, spike_count = self.index[chunk]
+        platform_ids = []
+        for _ in range(platform_count):
+            pid, x, y, w, h, anchored = PLATFORM.unpack_from(self.data, offset)
+            offset += PLATFORM.size
+            platform_ids.append(pid)
+            if pid in self.platforms:
+                rect, refs = self.platforms[pid]
+                self.platforms[pid] = (rect, refs + 1)
+            else:
+                self.platforms[pid] = (pygame.Rect(x, self.floor_y + y if anchored else y, w, h), 1)
+
+        spikes = []
+        for _ in range(spike_count):
+            sid, x, y = SPIKE.unpack_from(self.data, offset)
+            offset += SPIKE.size
+            if sid not in self.spent:
+                spike = Spike(x, y)
+                self.spike_ids[spike] = sid
+                spikes.append(spike)
+        return platform_ids, spikes
+
+    def _drop_chunk(self, chunk):
+        platform_ids, spikes = self.chunks.pop(chunk)
+        for pid in platform_ids:
+            rect, refs = self.platforms[pid]
+            if refs == 1:
+                del self.platforms[pid]
+            else:
+                self.platforms[pid] = (rect, refs - 1)
+        for spike in spikes:
+            sid = self.spike_ids.pop(spike, None)
+            if sid is not None and spike.falling:
+                self.spent.add(sid) # Would otherwise reset to the ceiling on reload
+        return spikes
+
+    def update(self, left, right):
+        """
+        Streams chunks for the world x-range [left, right).
+        Returns (new spikes, evicted spikes) when the resident set changed, else None.
+        """
+        cw = self.chunk_width
+        first = max(0, left // cw - self.margin)
+        last = min(self.chunk_count - 1, (right - 1) // cw + self.margin)
+        if (first, last) == self.window:
+            return None
+        self.window = (first, last)
+
+        added = []
+        evicted = []
+        changed = False
+        for chunk in range(first, last + 1):
+            if chunk not in self.chunks:
+                platform_ids, spikes = self._read_chunk(chunk)
+                self.chunks[chunk] = (platform_ids, spikes)
+                added.extend(spikes)
+                changed = True
+
+        for chunk in [c for c in self.chunks if c < first - self.keep or c > last + self.keep]:
+            evicted.extend(self._drop_chunk(chunk))
+            changed = True
+
+        if not changed:
+            return None
+        return added, evicted
+
+    def restore(self, chunks, window, spent):
+        """
+        Resets residency to exactly `chunks` with the given spent spike ids (for world
+        snapshots). Returns {level id: Spike} for the spikes the reload created.
+        """
+        self.chunks = {}
+        self.platforms = {}
+        self.spike_ids = {}
+        self.spent = set(spent)
+        for chunk in chunks:
+            self.chunks[chunk] = self._read_chunk(chunk)
+        self.window = window
+        return {sid: spike for spike, sid in self.spike_ids.items()}
+
+    def platform_rects(self):
+        """Resident platforms in level order."""
+        return [self.platforms[pid][0] for pid in sorted(self.platforms)]
+
+    def mark_spent(self, spike):
+        """A level spike fell or was used up; it won't come back when its chunk reloads."""
+        sid = self.spike_ids.pop(spike, None)
+        if sid is not None:
+            self.spent.add(sid)
+
+    def close(self):
+        self.data.close()
+        self._file.close()
+
+
+def main(argv):
+    if not argv or argv[0] != "convert":
+        sys.exit("usage: python -m core.level convert [OUT]")
+    path = argv[1] if len(argv) > 1 else DEFAULT_LEVEL
+    write_level(path, STAGE1_PLATFORMS, STAGE1_SPIKES, STAGE1_BOSSES, STAGE1_WIDTH)
+    print(f"[LEVEL] Wrote {path} ({os.path.getsize(path)} bytes)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
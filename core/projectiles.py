@@ -0,0 +1,142 @@
+import numpy as np
+
+
+class ProjectilePool:
+    """
+    Every live projectile in one fixed-capacity struct-of-arrays.
+    Slots [0, count) are alive and kept in spawn order; movement, despawning and
+    collision run as whole-array NumPy operations instead of per-object Python.
+    """
+
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self.x = np.zeros(capacity, np.int32)
+        self.y = np.zeros(capacity, np.int32)
+        self.width = np.zeros(capacity, np.int32)
+        self.height = np.zeros(capacity, np.int32)
+        self.speed = np.zeros(capacity, np.int32)
+        self.is_player = np.zeros(capacity, np.bool_)
+        self.color = np.zeros((capacity, 3), np.uint8)
+        self.source = np.zeros(capacity, np.uint8) # Index into self.sources, for damage attribution
+        self.sources = []
+        self._source_ids = {}
+        self.count = 0
+        self.max_width = 0 # Widest projectile ever spawned, for cheap target rejection
+        self.dropped = 0 # Spawns refused because the pool was full
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, x, y, speed, is_player, color, width=15, height=15, source="projectile"):
+        """
+        Adds a projectile. `source` names the attack it belongs to in damage reports.
+        Returns False (and drops it) when the pool is full.
+        """
+        i = self.count
+        if i >= self.capacity:
+            self.dropped += 1
+            return False
+        source_id = self._source_ids.get(source)
+        if source_id is None:
+            source_id = self._source_ids[source] = len(self.sources)
+            self.sources.append(source)
+        self.x[i] = x
+        self.y[i] = y
+        self.width[i] = width
+        self.height[i] = height
+        self.speed[i] = speed
+        self.is_player[i] = is_player
+        self.color[i] = color
+        self.source[i] = source_id
+        self.count = i + 1
+        if width > self.max_width:
+            self.max_width = width
+        return True
+
+    def clear(self):
+        self.count = 0
+
+    def _overlaps(self, n, rect):
+        """Batch colliderect of the first n projectiles against one pygame.Rect."""
+        x = self.x[:n]
+        y = self.y[:n]
+        return ((x < rect.right) & (rect.left < x + self.width[:n]) &
+                (y < rect.bottom) & (rect.top < y + self.height[:n]))
+
+    def update(self, player, targets):
+        """
+        Moves every projectile one frame, despawns the ones that left the player's
+        800px window and resolves hits. Player shots damage the first living target
+        they touch, enemy shots damage the player.
+        Returns (hits per target, {source: hits on the player}).
+        """
+        target_hits = [0] * len(targets)
+        player_hits = {}
+        n = self.count
+        if n == 0:
+            return target_hits, player_hits
+
+        self.x[:n] += self.speed[:n]
+        x = self.x[:n]
+        px = player.rect.x
+        dead = (x > px + 800) | (x < px - 800)
+
+        is_player = self.is_player[:n]
+        shots = is_player & ~dead
+        # Survivors all sit inside the player's window, so targets outside it are skipped in Python
+        reach_left = px - 800
+        reach_right = px + 800 + self.max_width
+        for t, target in enumerate(targets):
+            rect = target.rect
+            if target.hp <= 0 or rect.right <= reach_left or rect.left >= reach_right:
+                continue
+            if not np.count_nonzero(shots):
+                break
+            hit = np.flatnonzero(shots & self._overlaps(n, target.rect))
+            if hit.size == 0:
+                continue
+            # A target can only soak as many shots as it has hp left; later shots in
+            # spawn order fly on to the next target, exactly like the sequential loop did
+            hit = hit[:target.hp]
+            target.hp -= hit.size
+            target_hits[t] = hit.size
+            dead[hit] = True
+            shots[hit] = False
+
+        incoming = np.flatnonzero(~is_player & ~dead & self._overlaps(n, player.rect))
+        dead[incoming] = True
+        if incoming.size:
+            for source_id, hits in enumerate(np.bincount(self.source[incoming]).tolist()):
+                if hits:
+                    player_hits[self.sources[source_id]] = hits
+
+        if np.count_nonzero(dead):
+            self._compact(n, ~dead)
+        return target_hits, player_hits
+
+    def _compact(self, n, keep):
+        """Drops dead slots in one pass while keeping survivors in spawn order."""
+        alive = int(np.count_nonzero(keep))
+        for column in (self.x, self.y, self.width, self.height, self.speed, self.is_player, self.color, self.source):
+            column[:alive] = column[:n][keep]
+        self.count = alive
+
+    def draw_list(self, alpha=1.0, view=None):
+        """
+        (x, y, width, height, color) tuples of the live projectiles for the renderer.
+        alpha < 1 places them part way back along their last step (projectiles fly straight).
+        view=(left, top, right, bottom) in world units drops the ones off camera in one pass.
+        """
+        n = self.count
+        x = self.x[:n]
+        if alpha < 1.0:
+            x = x - np.rint(self.speed[:n] * (1.0 - alpha)).astype(np.int32)
+        y = self.y[:n]
+        width = self.width[:n]
+        height = self.height[:n]
+        color = self.color[:n]
+        if view is not None:
+            left, top, right, bottom = view
+            visible = (x < right) & (x + width > left) & (y < bottom) & (y + height > top)
+            x, y, width, height, color = x[visible], y[visible], width[visible], height[visible], color[visible]
+        return zip(x.tolist(), y.tolist(), width.tolist(), height.tolist(), map(tuple, color.tolist()))
@@ -0,0 +1,166 @@
+import math
+
+import pygame
+
+from core.timestep import lerp
+
+# Draw order, back to front
+LAYER_PLAYER = 0
+LAYER_BOSSES = 1
+LAYER_PROJECTILES = 2
+LAYER_HAZARDS = 3
+LAYER_COUNT = 4
+
+SKY = (135, 206, 235)
+
+
+class RenderQueue:
+    """
+    Collects one frame's sprites by layer, culls them against the camera and draws
+    each layer with a single Surface.blits() call.
+    Positions are submitted in world space; the queue maps them onto the canvas
+    (camera scroll, shake and render scale) once, at submit time.
+    """
+
+    def __init__(self, layer_count=LAYER_COUNT):
+        self.layers = [[] for _ in range(layer_count)]
+        self.solids = {} # (color, width, height) -> filled Surface, so rects batch like sprites
+        self.scroll_x = 0
+        self.offset_y = 0
+        self.scale = 1.0
+        self.view_width = 0
+        self.view_height = 0
+        # Per-frame counters
+        self.submitted = 0
+        self.culled = 0
+        self.draw_calls = 0
+
+    def begin(self, canvas, scroll_x, offset_y=0, scale=1.0):
+        """Starts a frame for a canvas showing the world from scroll_x, at the given render scale."""
+        for layer in self.layers:
+            layer.clear()
+        self.scroll_x = scroll_x
+        self.offset_y = offset_y
+        self.scale = scale
+        self.view_width, self.view_height = canvas.get_size()
+        self.submitted = 0
+        self.culled = 0
+        self.draw_calls = 0
+
+    def submit(self, layer, image, x, y):
+        """Queues an image whose top-left sits at world (x, y). Off-camera images are dropped here."""
+        self.submitted += 1
+        scale = self.scale
+        cx = round((x - self.scroll_x) * scale)
+        cy = round((y + self.offset_y) * scale)
+        width, height = image.get_size()
+        if cx >= self.view_width or cy >= self.view_height or cx + width <= 0 or cy + height <= 0:
+            self.culled += 1
+            return
+        self.layers[layer].append((image, (cx, cy)))
+
+    def submit_rect(self, layer, color, x, y, width, height):
+        """Queues a solid rect in world units, drawn as a cached filled surface."""
+        self.submit_rects(layer, ((x, y, width, height, color),))
+
+    def submit_rects(self, layer, rects):
+        """
+        Queues many (x, y, width, height, color) world-space rects at once, e.g. the
+        projectile pool's draw list. Same result as submit_rect() per item, minus the call overhead.
+        """
+        scale = self.scale
+        scroll_x = self.scroll_x
+        offset_y = self.offset_y
+        view_width = self.view_width
+        view_height = self.view_height
+        solids = self.solids
+        queued = self.layers[layer]
+        count = culled = 0
+        for x, y, width, height, color in rects:
+            count += 1
+            size = (max(1, round(width * scale)), max(1, round(height * scale)))
+            cx = round((x - scroll_x) * scale)
+            cy = round((y + offset_y) * scale)
+            if cx >= view_width or cy >= view_height or cx + size[0] <= 0 or cy + size[1] <= 0:
+                culled += 1
+                continue
+            key = (color, size)
+            image = solids.get(key)
+            if image is None:
+                image = solids[key] = pygame.Surface(size)
+                image.fill(color)
+            queued.append((image, (cx, cy)))
+        self.submitted += count
+        self.culled += culled
+
+    def view_rect(self):
+        """The world-space (left, top, right, bottom) the canvas shows, for culling in bulk."""
+        left = self.scroll_x
+        top = -self.offset_y
+        return left, top, left + self.view_width / self.scale, top + self.view_height / self.scale
+
+    def flush(self, canvas):
+        """Draws every queued layer back to front. Returns the number of draw calls made."""
+        for layer in self.layers:
+            if layer:
+                canvas.blits(layer, doreturn=False)
+                self.draw_calls += 1
+        return self.draw_calls
+
+
+def charge_radius(earth_boss):
+    """World-space radius of the Earth boss's charge glow."""
+    return earth_boss.rect.width // 2 + 30
+
+
+def submit_boss(queue, images, name, entity):
+    """Queues a boss sprite; a boss whose group is still loading shows as a plain silhouette."""
+    image = images.get(name)
+    if image is None:
+        queue.submit_rect(LAYER_BOSSES, (60, 60, 60), entity.rect.x, entity.rect.y, entity.rect.width, entity.rect.height)
+    else:
+        queue.submit(LAYER_BOSSES, image, entity.rect.x, entity.rect.y)
+
+
+def draw_world(canvas, queue, world, background, images, alpha=1.0, scale=1.0):
+    """
+    Draws the world into `canvas` where it was `alpha` of the way through the current
+    step: sky, backdrop and every sprite layer, at the given render scale. `background`
+    and `images` must be pre-scaled to match. Returns the interpolated camera scroll.
+    """
+    player = world.player
+    boss = world.boss
+    earth_boss = world.earth_boss
+    dragon_boss = world.dragon_boss
+    camera_scroll = lerp(world.prev_camera_scroll, world.camera_scroll, alpha)
+    player_x = lerp(world.prev_player_pos[0], player.rect.x, alpha, snap=100)
+    player_y = lerp(world.prev_player_pos[1], player.rect.y, alpha, snap=100)
+
+    canvas.fill(SKY)
+    shake_y = world.shake_y
+    render_scroll_x = camera_scroll + world.shake_x
+    background.draw(canvas, round(render_scroll_x * scale), round(shake_y * scale))
+
+    queue.begin(canvas, render_scroll_x, shake_y, scale)
+    queue.submit(LAYER_PLAYER, images["player"] if player.facing_right else images["player_left"], player_x, player_y)
+
+    if boss.hp > 0:
+        submit_boss(queue, images, "boss", boss)
+    if earth_boss.hp > 0:
+        if earth_boss.is_charging:
+            radius = charge_radius(earth_boss)
+            queue.submit(LAYER_BOSSES, images["charge_glow"], earth_boss.rect.centerx - radius, earth_boss.rect.centery - radius)
+        submit_boss(queue, images, "earth_boss", earth_boss)
+    if dragon_boss.hp > 0:
+        submit_boss(queue, images, "dragon_boss", dragon_boss)
+
+    queue.submit_rects(LAYER_PROJECTILES, world.projectiles.draw_list(alpha, queue.view_rect()))
+    spike_image = images["spike"]
+    spike_width = math.ceil(spike_image.get_width() / scale) # World units, for the awake-sector query
+    view_width = math.ceil(canvas.get_width() / scale)
+    for spike in world.spikes.awake(render_scroll_x - spike_width, render_scroll_x + view_width):
+        spike_y = spike.rect.y - round(spike.speed * (1.0 - alpha)) if spike.falling else spike.rect.y
+        queue.submit(LAYER_HAZARDS, spike_image, spike.rect.x, spike_y)
+
+    queue.flush(canvas)
+    return camera_scroll
@@ -0,0 +1,118 @@
+"""
+Deterministic input recording and replay.
+
+A replay file is a fixed header (seed and world size) followed by one byte per
+frame holding the FrameInput flags. Because every random roll in the world comes
+from its seeded generator, feeding the same bytes back reproduces a run exactly.
+
+Headless playback for profiling:
+    python -m core.replay run.rpl
+"""
+import os
+import struct
+import sys
+import time
+
+from core.engine import World, FrameInput
+
+MAGIC = b"RPLY"
+VERSION = 1
+HEADER = struct.Struct("<4sHIIHH") # magic, version, seed, frames, width, height
+
+# Bit order of the per-frame input byte. Append only, never reorder.
+FIELDS = ("left", "right", "jump", "jump_pressed", "fire", "restart")
+
+
+def pack_input(inputs):
+    bits = 0
+    for i, field in enumerate(FIELDS):
+        if getattr(inputs, field):
+            bits |= 1 << i
+    return bits
+
+
+def unpack_input(bits):
+    return FrameInput(*((bits >> i) & 1 == 1 for i in range(len(FIELDS))))
+
+
+class InputRecorder:
+    """Collects one byte per world step and writes the replay file on save()."""
+
+    def __init__(self, world):
+        self.seed = world.seed
+        self.width = world.width
+        self.height = world.height
+        self.frames = bytearray()
+
+    def record(self, inputs):
+        self.frames.append(pack_input(inputs))
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.seed, len(self.frames), self.width, self.height))
+            f.write(self.frames)
+
+
+class Replay:
+    """A loaded replay file. Hands back the recorded FrameInputs in order."""
+
+    def __init__(self, seed, width, height, frames):
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.frames = frames
+        self.cursor = 0
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, seed, count, width, height = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} replay file")
+        frames = data[HEADER.size:HEADER.size + count]
+        if len(frames) != count:
+            raise ValueError(f"{path} is truncated: {len(frames)} of {count} frames")
+        return cls(seed, width, height, frames)
+
+    def __len__(self):
+        return len(self.frames)
+
+    @property
+    def finished(self):
+        return self.cursor >= len(self.frames)
+
+    def next_input(self):
+        bits = self.frames[self.cursor]
+        self.cursor += 1
+        return unpack_input(bits)
+
+    def make_world(self, ai_brain=None):
+        """A fresh world in the exact starting state the recording began from."""
+        return World(self.width, self.height, ai_brain, seed=self.seed)
+
+
+def play_headless(replay):
+    """Runs a whole replay with no display as fast as possible. Returns the world."""
+    world = replay.make_world()
+    while not replay.finished:
+        world.step(replay.next_input())
+    return world
+
+
+def main(path):
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    replay = Replay.load(path)
+    start = time.perf_counter()
+    world = play_headless(replay)
+    elapsed = time.perf_counter() - start
+
+    player = world.player
+    print(f"[REPLAY] {len(replay)} frames in {elapsed:.3f}s ({len(replay) / max(elapsed, 1e-9):.0f} fps), seed {replay.seed}")
+    print(f"[REPLAY] Player at ({player.rect.x}, {player.rect.y}) hp {player.hp} | Boss hp {[b.hp for b in world.bosses]}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("usage: python -m core.replay FILE")
+    main(sys.argv[1])
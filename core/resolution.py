@@ -0,0 +1,106 @@
+import time
+
+import pygame
+
+# Internal render scales, best first. Each one has its own pre-scaled sprites and backdrop.
+SCALES = (1.0, 0.85, 0.7, 0.5)
+
+
+class DynamicResolution:
+    """
+    Picks the internal render resolution from measured frame time.
+    The world is drawn into an offscreen canvas at the current scale and stretched to
+    the display in one blit; the HUD is drawn afterwards at native resolution.
+
+    The stretch is a software blit with a fixed cost of its own, so a smaller canvas
+    is not automatically a faster frame. Each level's cost is predicted as the drawing
+    time scaled by pixel count plus the measured stretch time, and recent real
+    measurements of a level override the prediction.
+    """
+
+    def __init__(self, native_size, budget_ms=1000 / 60, scales=SCALES, smoothing=0.1, cooldown=45, memory=600):
+        self.native_size = native_size
+        self.budget_ms = budget_ms
+        self.scales = scales
+        self.smoothing = smoothing # EMA weight of the newest frame
+        self.cooldown = cooldown   # Frames to settle after a switch before judging again
+        self.memory = memory       # Frames a measured cost stays trusted (scenes change)
+        self.level = 0
+        self.frame_ms = 0.0        # Smoothed frame time at the current level
+        self.present_ms = None     # Smoothed stretch time, once a scaled level has run
+        self.wait = cooldown
+        self.frames = 0
+        self.switches = 0
+        self.measured = {}         # level -> (smoothed ms, frame it was measured on)
+        self.canvases = {}
+
+    @property
+    def scale(self):
+        return self.scales[self.level]
+
+    def canvas(self, screen, scale=None):
+        """Surface to draw the world into at `scale` (default: the current one); the screen itself at full scale."""
+        scale = self.scale if scale is None else scale
+        if scale == 1.0:
+            return screen
+        canvas = self.canvases.get(scale)
+        if canvas is None:
+            width, height = self.native_size
+            canvas = pygame.Surface((round(width * scale), round(height * scale)), 0, screen)
+            self.canvases[scale] = canvas
+        return canvas
+
+    def present(self, screen, canvas):
+        """Stretches the world canvas over the whole display (nearest neighbour: cheapest)."""
+        if canvas is screen:
+            return
+        start = time.perf_counter()
+        pygame.transform.scale(canvas, self.native_size, screen)
+        ms = (time.perf_counter() - start) * 1000
+        self.present_ms = ms if self.present_ms is None else self.present_ms + (ms - self.present_ms) * self.smoothing
+
+    def predict(self, level):
+        """Expected frame time at a level, or None while the stretch cost is still unknown."""
+        entry = self.measured.get(level)
+        if entry is not None and self.frames - entry[1] <= self.memory:
+            return entry[0]
+        scale = self.scales[level]
+        if scale < 1.0 and self.present_ms is None:
+            return None
+        stretch = self.present_ms or 0.0
+        draw = max(0.0, self.frame_ms - (stretch if self.scale < 1.0 else 0.0))
+        return draw * (scale / self.scale) ** 2 + (stretch if scale < 1.0 else 0.0)
+
+    def update(self, frame_ms):
+        """Feeds one frame's work time (excluding the frame cap's sleep). Returns True on a switch."""
+        self.frames += 1
+        self.frame_ms += (frame_ms - self.frame_ms) * self.smoothing
+        if self.wait > 0:
+            self.wait -= 1
+            return False
+        self.measured[self.level] = (self.frame_ms, self.frames)
+
+        target = self.level
+        if self.frame_ms > self.budget_ms:
+            # Best quality that should fit with headroom; failing that, whatever is cheapest
+            predicted = [(self.predict(level), level) for level in range(len(self.scales))]
+            fits = [level for ms, level in predicted if ms is not None and ms < self.budget_ms * 0.85]
+            cheaper = [(ms, level) for ms, level in predicted if ms is not None and ms < self.frame_ms * 0.95]
+            if fits:
+                target = min(fits)
+            elif cheaper:
+                target = min(cheaper)[1]
+            elif self.level < len(self.scales) - 1 and self.present_ms is None:
+                target = self.level + 1 # Nothing known yet: a smaller canvas is the only lead
+        elif self.level > 0:
+            # Headroom: climb one level if it should still fit, so the scale doesn't flap
+            predicted = self.predict(self.level - 1)
+            if predicted is not None and predicted < self.budget_ms * 0.85:
+                target = self.level - 1
+
+        if target == self.level:
+            return False
+        self.level = target
+        self.wait = self.cooldown
+        self.switches += 1
+        return True
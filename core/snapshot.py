@@ -0,0 +1,241 @@
+"""
+World snapshots: the complete simulation state packed into one compact bytes blob.
+
+capture() and restore() only copy numbers, so a snapshot costs tens of microseconds
+either way. The world uses them for exact restarts and stage checkpoints, and
+SnapshotRing keeps the last few seconds for rewinding while debugging.
+
+Configuration (boss timings, wake radii, the level file itself) is not state and is
+not stored; a snapshot can only be restored into a world built from the same level.
+"""
+import struct
+from array import array
+
+import numpy as np
+
+from core.activation import SectorGrid
+from core.spatial import PlatformIndex
+from entities.enemies import Spike
+
+MAGIC = b"SNAP"
+VERSION = 1
+HEADER = struct.Struct("<4sHI")         # magic, version, frame
+WORLD = struct.Struct("<diiiiii?III")   # true scroll, camera scroll, previous camera scroll, previous player x/y,
+                                        # shake x/y, AI triggered, jumps, shots fired, shots hit
+RNG = struct.Struct("<id?")             # Mersenne Twister version, cached gauss value, whether it is set
+PLAYER = struct.Struct("<iiiidi??")     # x, y, spawn x/y, vertical velocity, hp, jumping, facing right
+BOSSES = struct.Struct("<iiii?iiii?H")  # boss hp/timer, earth hp/timer/charging, dragon hp/action/ultimate/
+                                        # shake timers, dragon shaking, dragon state (name id)
+COUNTS = struct.Struct("<HHHHiiHHIHii") # names, damage sources, tactics, pool sources, pool count, pool max width,
+                                        # spikes, falling spikes, spent ids, resident chunks, window first/last
+POOL = struct.Struct("<I")              # spawns dropped by the full pool
+PAIR_INT = struct.Struct("<Hi")         # name id, amount
+PAIR_FLOAT = struct.Struct("<Hd")       # name id, weight (always a number: DragonBoss.update_tactics coerces them)
+SPIKE = struct.Struct("<iihH?i")        # x, y, speed, source (name id), falling, level id (-1: dropped by the Dragon)
+RNG_WORDS = 625
+
+
+def _columns(pool):
+    return (pool.x, pool.y, pool.width, pool.height, pool.speed, pool.is_player, pool.color, pool.source)
+
+
+def capture(world):
+    """Packs the world's whole simulation state into bytes."""
+    names = []
+    name_ids = {}
+
+    def name_id(name):
+        i = name_ids.get(name)
+        if i is None:
+            i = name_ids[name] = len(names)
+            names.append(name)
+        return i
+
+    player = world.player
+    boss = world.boss
+    earth = world.earth_boss
+    dragon = world.dragon_boss
+    pool = world.projectiles
+    level = world.level
+    profile = world.player_profile
+    version, words, gauss = world.rng.getstate()
+
+    body = [
+        WORLD.pack(world.true_scroll, world.camera_scroll, world.prev_camera_scroll, *world.prev_player_pos,
+                   world.shake_x, world.shake_y, world.ai_triggered,
+                   profile["total_jumps"], profile["shots_fired"], profile["shots_hit"]),
+        RNG.pack(version, gauss or 0.0, gauss is not None),
+        array("I", words).tobytes(),
+        PLAYER.pack(player.rect.x, player.rect.y, player.spawn_x, player.spawn_y, player.vel_y, player.hp,
+                    player.is_jumping, player.facing_right),
+        BOSSES.pack(boss.hp, boss.attack_timer, earth.hp, earth.attack_timer, earth.is_charging,
+                    dragon.hp, dragon.action_timer, dragon.ultimate_timer, dragon.shake_timer, dragon.is_shaking,
+                    name_id(dragon.current_state)),
+        POOL.pack(pool.dropped),
+    ]
+    body.extend(PAIR_INT.pack(name_id(source), amount) for source, amount in player.damage_taken.items())
+    body.extend(PAIR_FLOAT.pack(name_id(key), weight) for key, weight in dragon.tactics.items())
+    body.append(array("H", [name_id(source) for source in pool.sources]).tobytes())
+    n = pool.count
+    body.extend(column[:n].tobytes() for column in _columns(pool))
+
+    spikes = list(world.spikes) # Insertion order, which is the order they update in
+    order = {spike: i for i, spike in enumerate(spikes)}
+    spike_ids = level.spike_ids
+    body.extend(SPIKE.pack(s.rect.x, s.rect.y, s.speed, name_id(s.source), s.falling, spike_ids.get(s, -1))
+                for s in spikes)
+    body.append(array("H", [order[spike] for spike in world.falling_spikes]).tobytes())
+    body.append(array("I", sorted(level.spent)).tobytes())
+    chunks = sorted(level.chunks)
+    body.append(array("H", chunks).tobytes())
+
+    first, last = level.window if level.window is not None else (-1, -1)
+    encoded = [name.encode() for name in names]
+    head = [
+        HEADER.pack(MAGIC, VERSION, world.frame),
+        COUNTS.pack(len(names), len(player.damage_taken), len(dragon.tactics), len(pool.sources), n, pool.max_width,
+                    len(spikes), len(world.falling_spikes), len(level.spent), len(chunks), first, last),
+    ]
+    head.extend(bytes((len(name),)) + name for name in encoded)
+    return b"".join(head + body)
+
+
+def restore(world, blob):
+    """
+    Puts the world back exactly as capture() saw it. The player, bosses and projectile
+    pool are updated in place, so references held elsewhere stay valid.
+    """
+    magic, version, frame = HEADER.unpack_from(blob)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"not a version {VERSION} world snapshot")
+    offset = HEADER.size
+    (name_count, damage_count, tactics_count, source_count, n, max_width,
+     spike_count, falling_count, spent_count, chunk_count, first, last) = COUNTS.unpack_from(blob, offset)
+    offset += COUNTS.size
+    names = []
+    for _ in range(name_count):
+        length = blob[offset]
+        names.append(blob[offset + 1:offset + 1 + length].decode())
+        offset += 1 + length
+
+    world.frame = frame
+    (world.true_scroll, world.camera_scroll, world.prev_camera_scroll, prev_x, prev_y, world.shake_x, world.shake_y,
+     world.ai_triggered, jumps, fired, hit) = WORLD.unpack_from(blob, offset)
+    offset += WORLD.size
+    world.prev_player_pos = (prev_x, prev_y)
+    world.player_profile.update(total_jumps=jumps, shots_fired=fired, shots_hit=hit)
+
+    rng_version, gauss, has_gauss = RNG.unpack_from(blob, offset)
+    offset += RNG.size
+    words = array("I")
+    words.frombytes(blob[offset:offset + RNG_WORDS * 4])
+    offset += RNG_WORDS * 4
+    world.rng.setstate((rng_version, tuple(words), gauss if has_gauss else None))
+
+    player = world.player
+    (player.rect.x, player.rect.y, player.spawn_x, player.spawn_y, player.vel_y, player.hp,
+     player.is_jumping, player.facing_right) = PLAYER.unpack_from(blob, offset)
+    offset += PLAYER.size
+
+    boss = world.boss
+    earth = world.earth_boss
+    dragon = world.dragon_boss
+    (boss.hp, boss.attack_timer, earth.hp, earth.attack_timer, earth.is_charging,
+     dragon.hp, dragon.action_timer, dragon.ultimate_timer, dragon.shake_timer, dragon.is_shaking,
+     state) = BOSSES.unpack_from(blob, offset)
+    offset += BOSSES.size
+    dragon.current_state = names[state]
+
+    pool = world.projectiles
+    pool.dropped, = POOL.unpack_from(blob, offset)
+    offset += POOL.size
+
+    damage = {}
+    for _ in range(damage_count):
+        source, amount = PAIR_INT.unpack_from(blob, offset)
+        damage[names[source]] = amount
+        offset += PAIR_INT.size
+    player.damage_taken = damage
+
+    tactics = {}
+    for _ in range(tactics_count):
+        key, weight = PAIR_FLOAT.unpack_from(blob, offset)
+        tactics[names[key]] = int(weight) if weight.is_integer() else weight
+        offset += PAIR_FLOAT.size
+    dragon.tactics = tactics
+
+    sources = array("H")
+    sources.frombytes(blob[offset:offset + source_count * 2])
+    offset += source_count * 2
+    pool.sources = [names[i] for i in sources]
+    pool._source_ids = {name: i for i, name in enumerate(pool.sources)}
+    for column in _columns(pool):
+        size = n * column[:1].nbytes
+        column[:n] = np.frombuffer(blob, column.dtype, n * column[0].size, offset).reshape(column[:n].shape)
+        offset += size
+    pool.count = n
+    pool.max_width = max_width
+
+    states = [SPIKE.unpack_from(blob, offset + i * SPIKE.size) for i in range(spike_count)]
+    offset += spike_count * SPIKE.size
+    falling = array("H")
+    falling.frombytes(blob[offset:offset + falling_count * 2])
+    offset += falling_count * 2
+    spent = array("I")
+    spent.frombytes(blob[offset:offset + spent_count * 4])
+    offset += spent_count * 4
+    chunks = array("H")
+    chunks.frombytes(blob[offset:offset + chunk_count * 2])
+
+    # Reload the resident chunks, then put each spike back where it was
+    level = world.level
+    resident = level.restore(chunks, None if first < 0 else (first, last), spent)
+    spikes = []
+    grid = SectorGrid()
+    for x, y, speed, source, is_falling, level_id in states:
+        spike = resident.pop(level_id) if level_id >= 0 else Spike(x, y, names[source])
+        spike.rect.x = x
+        spike.rect.y = y
+        spike.speed = speed
+        spike.source = names[source]
+        spike.falling = is_falling
+        spikes.append(spike)
+        grid.append(spike)
+    for spike in resident.values(): # Already gone when the snapshot was taken
+        level.mark_spent(spike)
+    world.spikes = grid
+    world.falling_spikes = [spikes[i] for i in falling]
+    world.platforms = level.platform_rects()
+    world.platform_index = PlatformIndex(world.platforms)
+
+
+class SnapshotRing:
+    """
+    The last `capacity` snapshots, oldest overwritten first. rewind() steps back
+    through them, dropping the ones it passes, so repeated rewinds go further back.
+    """
+
+    def __init__(self, capacity=600):
+        self.capacity = capacity
+        self.slots = [None] * capacity
+        self.head = 0  # Next slot to write
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def push(self, blob):
+        self.slots[self.head] = blob
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def rewind(self, steps):
+        """The snapshot `steps` pushes back (or the oldest one kept), or None when empty."""
+        if self.count == 0:
+            return None
+        steps = min(max(1, steps), self.count)
+        self.head = (self.head - steps) % self.capacity
+        self.count -= steps - 1 # The snapshot we land on stays, as the newest
+        blob = self.slots[self.head]
+        self.head = (self.head + 1) % self.capacity
+        return blob
@@ -0,0 +1,38 @@
+class PlatformIndex:
+    """
+    Static broadphase for level geometry: a uniform grid hash over the x-axis.
+    Built once from the platform list, then queried for the few rects near the player
+    so collision cost no longer grows with level length.
+    """
+
+    def __init__(self, platforms, cell_size=512):
+        self.platforms = list(platforms)
+        self.cell_size = cell_size
+        self.cells = {}
+
+        # A platform is filed under every cell its x-extent touches
+        for i, plat in enumerate(self.platforms):
+            first = plat.left // cell_size
+            last = (plat.right - 1) // cell_size
+            for cell in range(first, last + 1):
+                self.cells.setdefault(cell, []).append(i)
+
+    def query(self, left, right):
+        """Returns the platforms overlapping the x-range [left, right), in original list order."""
+        cells = self.cells
+        first = left // self.cell_size
+        last = (right - 1) // self.cell_size
+
+        # Fast path: the player almost always sits inside a single cell
+        if first == last:
+            return [self.platforms[i] for i in cells.get(first, ())]
+
+        hits = set()
+        for cell in range(first, last + 1):
+            hits.update(cells.get(cell, ()))
+        # Keep list order so collision resolution matches a plain linear scan
+        return [self.platforms[i] for i in sorted(hits)]
+
+    def near(self, rect, margin):
+        """Candidates for a rect that may move up to `margin` pixels sideways this frame."""
+        return self.query(rect.left - margin, rect.right + margin)
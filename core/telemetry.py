@@ -0,0 +1,166 @@
+import json
+import time
+from array import array
+
+SCOPES = ("input", "physics", "boss_ai", "projectiles", "spikes", "render", "flip", "frame")
+
+
+class _Scope:
+    """A reusable timing context for one named scope. Not re-entrant, by design."""
+    __slots__ = ("timer", "name", "start")
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.timer.record(self.name, time.perf_counter() - self.start)
+
+
+class _NullScope:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+
+NULL_SCOPE = _NullScope()
+
+
+class FrameTimer:
+    """
+    Per-subsystem frame timing. Every scope records into its own preallocated ring
+    buffer, so steady-state recording never allocates. While disabled, scope() hands
+    back a shared no-op context, which keeps the instrumentation cheap enough to ship.
+    """
+
+    def __init__(self, scopes=SCOPES, capacity=600, enabled=False):
+        self.enabled = enabled
+        self.capacity = capacity
+        self.samples = {name: array("d", bytes(8 * capacity)) for name in scopes}
+        self.cursor = dict.fromkeys(scopes, 0)
+        self.filled = dict.fromkeys(scopes, 0)
+        self._scopes = {name: _Scope(self, name) for name in scopes}
+
+        # HUD text is only re-rendered every few frames
+        self.overlay_visible = False
+        self._overlay_lines = []
+        self._overlay_age = 0
+
+    def scope(self, name):
+        if not self.enabled:
+            return NULL_SCOPE
+        return self._scopes[name]
+
+    def start(self, name):
+        """Manual form of scope() for spans too long to indent under a with-block."""
+        if self.enabled:
+            self._scopes[name].start = time.perf_counter()
+
+    def stop(self, name):
+        scope = self._scopes[name]
+        # A zero start means timing was switched on mid-span, so there is nothing to record
+        if self.enabled and scope.start:
+            self.record(name, time.perf_counter() - scope.start)
+        scope.start = 0.0
+
+    def record(self, name, seconds):
+        i = self.cursor[name]
+        self.samples[name][i] = seconds
+        self.cursor[name] = (i + 1) % self.capacity
+        if self.filled[name] < self.capacity:
+            self.filled[name] += 1
+
+    def reset(self):
+        for name in self.samples:
+            self.cursor[name] = 0
+            self.filled[name] = 0
+
+    def percentiles(self, name, points=(50, 95, 99)):
+        """Nearest-rank percentiles of the buffered samples, in milliseconds."""
+        count = self.filled[name]
+        if count == 0:
+            return tuple(0.0 for _ in points)
+        ordered = sorted(self.samples[name][:count])
+        return tuple(ordered[min(count - 1, count * p // 100)] * 1000 for p in points)
+
+    def report(self):
+        """{scope: (p50, p95, p99)} in milliseconds, for every scope with samples."""
+        return {name: self.percentiles(name) for name in self.samples if self.filled[name]}
+
+    def toggle_overlay(self):
+        """The HUD needs data, so showing it also switches recording on."""
+        self.overlay_visible = not self.overlay_visible
+        if self.overlay_visible:
+            self.enabled = True
+            self._overlay_age = 0
+
+    def draw_overlay(self, screen, font, x, y, refresh=30):
+        if not self.overlay_visible:
+            return
+        self._overlay_age -= 1
+        if self._overlay_age <= 0:
+            self._overlay_age = refresh
+            lines = [f"{'scope':<12}{'p50':>7}{'p95':>7}{'p99':>7}  ms"]
+            for name, (p50, p95, p99) in self.report().items():
+                lines.append(f"{name:<12}{p50:>7.2f}{p95:>7.2f}{p99:>7.2f}")
+            self._overlay_lines = [font.render(line, True, (255, 255, 255), (0, 0, 0)) for line in lines]
+
+        for line in self._overlay_lines:
+            screen.blit(line, (x, y))
+            y += line.get_height()
+
+    def dump(self, path=None):
+        """Writes percentiles plus the raw ring buffers (ms, oldest first) as CSV. Returns the path."""
+        if path is None:
+            path = time.strftime("frame_timings_%Y%m%d_%H%M%S.csv")
+        with open(path, "w") as f:
+            f.write("scope,samples,p50_ms,p95_ms,p99_ms,raw_ms\n")
+            for name, samples in self.samples.items():
+                count = self.filled[name]
+                start = self.cursor[name] if count == self.capacity else 0
+                ordered = [samples[(start + i) % self.capacity] * 1000 for i in range(count)]
+                p50, p95, p99 = self.percentiles(name)
+                raw = " ".join(f"{ms:.4f}" for ms in ordered)
+                f.write(f"{name},{count},{p50:.4f},{p95:.4f},{p99:.4f},{raw}\n")
+        return path
+
+
+class StartupTimer:
+    """
+    Milestones from launch to the first playable frame and beyond, as offsets from
+    when the timer was created (which main.py does before importing anything heavy).
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.marks = [] # (milestone, seconds since origin)
+
+    def mark(self, name):
+        self.marks.append((name, time.perf_counter() - self.origin))
+
+    def report(self):
+        """One line per milestone: total time and time since the previous one."""
+        lines = [f"{'milestone':<28}{'total':>9}{'step':>9}  ms"]
+        previous = 0.0
+        for name, seconds in self.marks:
+            lines.append(f"{name:<28}{seconds * 1000:>9.1f}{(seconds - previous) * 1000:>9.1f}")
+            previous = seconds
+        return lines
+
+    def dump(self, path):
+        """Writes the milestones as JSON ({name: ms}), for tracking time-to-first-frame across builds."""
+        with open(path, "w") as f:
+            json.dump({name: round(seconds * 1000, 2) for name, seconds in self.marks}, f, indent=2)
+        return path
+
+
+# Shared by the world and the renderer, like a logger
+frame_timer = FrameTimer()
@@ -0,0 +1,25 @@
+from collections import OrderedDict
+
+
+class TextCache:
+    """
+    Rendered text surfaces keyed by (font, string, color), evicted least-recently-used.
+    HUD text that doesn't change costs one dict lookup and a blit instead of a font.render.
+    """
+
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, color, antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
@@ -0,0 +1,51 @@
+"""
+Fixed-timestep scheduling.
+
+The world always advances in whole 1/60 s steps, so physics constants like the
+0.8 px/frame gravity mean the same thing at any display refresh rate. Rendering runs
+as fast as it likes and draws entities interpolated between the last two steps.
+"""
+import time
+
+STEP_RATE = 60
+
+
+class FixedTimestep:
+    """
+    Accumulator scheduler. advance() reports how many simulation steps are due this
+    render frame; alpha is how far the render time sits between the last two steps.
+    """
+
+    def __init__(self, rate=STEP_RATE, max_steps=5):
+        self.step = 1.0 / rate
+        self.max_steps = max_steps # Spiral-of-death guard: catch-up steps allowed per render frame
+        self.accumulator = 0.0
+        self.alpha = 0.0
+        self.last = None
+        self.dropped = 0.0 # Seconds of simulation skipped because frames fell too far behind
+
+    def advance(self, now=None):
+        now = time.perf_counter() if now is None else now
+        if self.last is None:
+            self.accumulator = self.step # The very first frame always simulates once
+        else:
+            self.accumulator += now - self.last
+        self.last = now
+
+        steps = int(self.accumulator / self.step)
+        if steps > self.max_steps:
+            # Under load the game slows down instead of stepping ever more to catch up
+            skipped = (steps - self.max_steps) * self.step
+            self.dropped += skipped
+            self.accumulator -= skipped
+            steps = self.max_steps
+        self.accumulator = max(0.0, self.accumulator - steps * self.step) # Float dust can dip below zero
+        self.alpha = self.accumulator / self.step
+        return steps
+
+
+def lerp(previous, current, alpha, snap=None):
+    """Blends two step positions. Jumps longer than `snap` (teleports, respawns) aren't smeared."""
+    if snap is not None and abs(current - previous) > snap:
+        return current
+    return round(previous + (current - previous) * alpha)
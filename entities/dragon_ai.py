@@ -1,12 +1,29 @@
+import math
 import pygame
 import random
-# Assuming Projectile and Spike classes are defined in your entities module
-from entities.enemies import Projectile, Spike 
+from entities.enemies import Spike 
+from core.events import event_log, BOSS_ATTACK, TACTICS
+
+
+def _weight(value):
+    """An attack weight as a number clamped to 1-10, or None if the LLM sent something that isn't one."""
+    try:
+        weight = float(value)
+    except (TypeError, ValueError):
+        return None
+    if not math.isfinite(weight):
+        return None
+    weight = min(10.0, max(1.0, weight))
+    return int(weight) if weight.is_integer() else weight
 
 class DragonBoss:
-    def __init__(self, x, y):
+    __slots__ = ("rect", "hp", "rng", "tactics", "current_state", "action_timer", "ultimate_timer",
+                 "is_shaking", "shake_timer", "wake_radius")
+
+    def __init__(self, x, y, rng=None):
         self.rect = pygame.Rect(x, y, 700, 600)
         self.hp = 100
+        self.rng = rng or random # Seeded by the world so replays roll the same dice
         
         # The baseline stats before the AI DM injects new weights
         self.tactics = {
@@ -27,26 +44,38 @@ class DragonBoss:
         self.is_shaking = False
         self.shake_timer = 0
 
+        # Wakes up when the player gets this close (see core.activation)
+        self.wake_radius = 900
+
     def update_tactics(self, new_tactics):
-        """Called by the background AI thread to overwrite the boss's brain."""
-        # Sanity check: Ensure the LLM didn't hallucinate weird keys
+        """
+        Swaps in new attack weights. Returns whether they were accepted.
+        Only ever called on the game thread (World.trigger_ai and AITacticalBrain.apply_pending),
+        so choose_attack never sees a half-written dict and nothing here needs a lock.
+        """
+        # Sanity check: Ensure the LLM didn't hallucinate weird keys or send weights that aren't numbers.
+        # Snapshots pack every weight as a float, so nothing else may reach self.tactics.
         expected_keys = ["projectiles", "spike_drop", "earthquake"]
         if all(key in new_tactics for key in expected_keys):
-            self.tactics = new_tactics
-        else:
-            print("[SYSTEM] Rejected invalid tactics dictionary from AI.")
+            tactics = {key: _weight(new_tactics[key]) for key in expected_keys}
+            if None not in tactics.values():
+                self.tactics = tactics
+                event_log.log(TACTICS, "accepted", *(round(tactics[key]) for key in expected_keys))
+                return True
+        event_log.log(TACTICS, "rejected")
+        return False
 
     def choose_attack(self):
         """Rolls the loaded dice based on the AI's weights."""
         attacks = list(self.tactics.keys())
         weights = list(self.tactics.values())
         
-        # random.choices uses the integer weights to bias the selection
-        self.current_state = random.choices(attacks, weights=weights, k=1)[0]
+        # rng.choices uses the integer weights to bias the selection
+        self.current_state = self.rng.choices(attacks, weights=weights, k=1)[0]
 
     def update(self, player, projectiles_list, spikes_list):
-        if self.hp <= 0 or abs(player.rect.x - self.rect.x) > 900:
-            return # Don't fight if dead or player is too far away
+        if self.hp <= 0:
+            return # Don't fight if dead
 
         # --- SCREEN SHAKE DURATION HANDLER ---
         if self.is_shaking:
@@ -57,13 +86,13 @@ class DragonBoss:
         # --- 1. THE HARDCODED ULTIMATE ---
         self.ultimate_timer -= 1
         if self.ultimate_timer <= 0:
-            print("[BOSS] EXECUTING MASSIVE FIRE BLAST!")
+            event_log.log(BOSS_ATTACK, "fire_blast", self.rect.x, self.rect.y)
             # Spawn a massive, slow projectile covering half the screen
             spawn_x = self.rect.left
             spawn_y = self.rect.centery - 100
             
-            # Massive Hitbox: Passing 150 width and 150 height to the Projectile class
-            projectiles_list.append(Projectile(spawn_x, spawn_y, -4, False, (255, 100, 0), 150, 150)) 
+            # Massive Hitbox: Passing 150 width and 150 height to the projectile pool
+            projectiles_list.spawn(spawn_x, spawn_y, -4, False, (255, 100, 0), 150, 150, source="fire_blast")
             self.ultimate_timer = 600 # Reset 10-second timer
             return # Skip standard attacks this frame
 
@@ -74,19 +103,19 @@ class DragonBoss:
             self.execute_attack(player, projectiles_list, spikes_list)
 
     def execute_attack(self, player, projectiles_list, spikes_list):
-        print(f"[BOSS] AI selected: {self.current_state} | Current Weights: {self.tactics}")
+        event_log.log(BOSS_ATTACK, self.current_state, self.rect.x, self.rect.y)
         
         if self.current_state == "projectiles":
             # Shoot a fast projectile directly at the player's height
             spawn_x = self.rect.left
             spawn_y = player.rect.centery 
             # Default 15x15 size will be used here since we omit the dimensions
-            projectiles_list.append(Projectile(spawn_x, spawn_y, -12, False, (255, 50, 50)))
+            projectiles_list.spawn(spawn_x, spawn_y, -12, False, (255, 50, 50), source="dragon_shot")
             self.action_timer = 60 # 1 second cooldown for fast attacks
             
         elif self.current_state == "spike_drop":
             # Spawn a spike directly over the player
-            spikes_list.append(Spike(player.rect.x, player.rect.y - 400))
+            spikes_list.append(Spike(player.rect.x, player.rect.y - 400, "spike_drop"))
             self.action_timer = 90 # 1.5 second cooldown
             
         elif self.current_state == "earthquake":
@@ -96,8 +125,5 @@ class DragonBoss:
             
             # Punish the player if they are physically on the ground
             if player.vel_y == 0:
-                player.hp -= 15
-                print("PLAYER TOOK EARTHQUAKE DAMAGE!")
-            else:
-                print("PLAYER DODGED THE EARTHQUAKE!")
+                player.take_damage(15, "earthquake") # Dodges show up as quakes with no damage event
             self.action_timer = 150 # 2.5 second cooldown (heavy attack recovery)
\ No newline at end of file
@@ -1,60 +1,80 @@
 import pygame
 
+from core.events import event_log, BOSS_ATTACK
+
 class Boss:
+    __slots__ = ("rect", "hp", "attack_timer", "wake_radius", "low_volley_frame", "high_volley_frame")
+
     def __init__(self, x, y):
         self.rect = pygame.Rect(x, y, 450, 350)
         self.hp = 30
         self.attack_timer = 0
+        self.wake_radius = 800 # Only fights while the player is this close (see core.activation)
+        # Volley timings in frames (tools/balance.py can override these)
+        self.low_volley_frame = 60
+        self.high_volley_frame = 120
 
     def update(self, player, projectiles_list):
-        if self.hp > 0 and abs(player.rect.x - self.rect.x) < 800:
+        if self.hp > 0:
             self.attack_timer += 1
             
             # Bottom Array: Fires at 60 frames
-            if self.attack_timer == 60:
+            if self.attack_timer == self.low_volley_frame:
+                event_log.log(BOSS_ATTACK, "boss_volley", self.rect.x, self.rect.y)
                 spawn_x = self.rect.left
                 for offset in [0, 25, 50]: # Spawns a 3-bullet wall
                     spawn_y = self.rect.bottom - 50 - offset
-                    projectiles_list.append(Projectile(spawn_x, spawn_y, -8, False, (169, 169, 169)))
+                    projectiles_list.spawn(spawn_x, spawn_y, -8, False, (169, 169, 169), source="boss_volley")
             
             # Top Array: Fires at 120 frames (1 second later to catch jumpers)
-            elif self.attack_timer >= 120:
+            elif self.attack_timer >= self.high_volley_frame:
+                event_log.log(BOSS_ATTACK, "boss_volley", self.rect.x, self.rect.y)
                 spawn_x = self.rect.left
                 for offset in [0, 25, 50]: 
                     spawn_y = self.rect.bottom - 220 - offset
-                    projectiles_list.append(Projectile(spawn_x, spawn_y, -8, False, (169, 169, 169)))
+                    projectiles_list.spawn(spawn_x, spawn_y, -8, False, (169, 169, 169), source="boss_volley")
                 
                 self.attack_timer = 0 # Reset the cycle
 
 class EarthBoss:
+    __slots__ = ("rect", "hp", "attack_timer", "is_charging", "wake_radius", "charge_frame", "strike_frame")
+
     def __init__(self, x, y):
         self.rect = pygame.Rect(x, y, 450, 450)
         self.hp = 50
         self.attack_timer = 0
         self.is_charging = False # New state variable
+        self.wake_radius = 800
+        # Charge window in frames: the tell starts at charge_frame, the slam lands at strike_frame
+        self.charge_frame = 180
+        self.strike_frame = 270
 
     def update(self, player):
-        if self.hp > 0 and abs(player.rect.x - self.rect.x) < 800:
+        if self.hp > 0:
             self.attack_timer += 1
             
             # The Tell: 1 second (60 frames) before the attack hits
-            if self.attack_timer == 180:
-                self.is_charging = True
-                print("[VISUAL CUE] EARTH BOSS IS GLOWING YELLOW - PREPARE TO JUMP!")
+            if self.attack_timer == self.charge_frame:
+                self.is_charging = True # The renderer shows the glow; the log records the tell
+                event_log.log(BOSS_ATTACK, "earth_charge", self.rect.x, self.rect.y)
             
             # The Strike: Hits at 270 frames
-            if self.attack_timer >= 270:
+            if self.attack_timer >= self.strike_frame:
                 self.is_charging = False
+                event_log.log(BOSS_ATTACK, "earth_slam", self.rect.x, self.rect.y)
                 
                 # Check if the player is physically airborne, not just if they pressed jump
                 if player.vel_y == 0: 
-                    player.hp -= 15
+                    player.take_damage(15, "earth_slam")
                     
                 self.attack_timer = 0
 
 class Spike:
-    def __init__(self, x, y):
+    __slots__ = ("rect", "source", "falling", "speed")
+
+    def __init__(self, x, y, source="spike"):
         self.rect = pygame.Rect(x, y, 30, 80)
+        self.source = source
         self.falling = False
         self.speed = 14
 
@@ -67,12 +87,5 @@ class Spike:
             self.rect.y += self.speed
             
         if self.rect.colliderect(player.rect):
-            player.hp -= 10
+            player.take_damage(10, self.source)
             self.rect.y = 3000 # Teleport away out of bounds after hit
-
-class Projectile:
-    def __init__(self, x, y, speed, is_player, color, width=15, height=15):
-        self.rect = pygame.Rect(x, y, width, height)
-        self.speed = speed
-        self.is_player = is_player
-        self.color = color
\ No newline at end of file
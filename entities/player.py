@@ -1,6 +1,10 @@
 import pygame
 
+from core.events import event_log, DAMAGE, DEATH
+
 class Player:
+    __slots__ = ("spawn_x", "spawn_y", "rect", "vel_y", "is_jumping", "speed", "hp", "facing_right", "damage_taken")
+
     def __init__(self, x, y):
         self.spawn_x = x
         self.spawn_y = y
@@ -10,19 +14,27 @@ class Player:
         self.speed = 6
         self.hp = 100 
         self.facing_right = True
+        self.damage_taken = {} # source -> total damage, for balancing reports
+
+    def take_damage(self, amount, source):
+        was_alive = self.hp > 0
+        self.hp -= amount
+        self.damage_taken[source] = self.damage_taken.get(source, 0) + amount
+        event_log.log(DAMAGE, source, amount, self.hp)
+        if was_alive and self.hp <= 0:
+            event_log.log(DEATH, "player", self.rect.x, self.rect.y)
 
-    def move(self, platforms):
-        keys = pygame.key.get_pressed()
+    def move(self, platforms, inputs):
         dx = 0
         
-        if keys[pygame.K_LEFT]: 
+        if inputs.left: 
             dx = -self.speed
             self.facing_right = False
-        if keys[pygame.K_RIGHT]: 
+        if inputs.right: 
             dx = self.speed
             self.facing_right = True
             
-        if keys[pygame.K_SPACE] and not self.is_jumping:
+        if inputs.jump and not self.is_jumping:
             self.vel_y = -20
             self.is_jumping = True
 
@@ -50,7 +62,7 @@ class Player:
 
         # Death Pit Respawn
         if self.rect.y > 2000 and self.hp > 0:
-            self.hp -= 5
+            self.take_damage(5, "pit")
             self.rect.x = self.spawn_x
             self.rect.y = self.spawn_y
             self.vel_y = 0
\ No newline at end of file
@@ -1,12 +1,35 @@
+import time
+from core.telemetry import StartupTimer
+startup = StartupTimer() # Before the heavy imports, so they are on the report
+
 import pygame
 import sys
 import os
-import random
-
-from entities.player import Player
-from entities.enemies import Boss, EarthBoss, Spike, Projectile
-from entities.dragon_ai import DragonBoss
-from ai_brain.orchestrator import AITacticalBrain
+import argparse
+
+from core.engine import World, FrameInput
+from core.snapshot import SnapshotRing, restore
+from core.replay import InputRecorder, Replay
+from core.background import TiledBackground
+from core.assets import SpriteSpec, AssetLoader
+from core.telemetry import frame_timer
+from core.events import event_log, RENDER_SCALE
+from core.text import TextCache
+from core.timestep import FixedTimestep
+from core.resolution import DynamicResolution
+from core.render import RenderQueue, draw_world, charge_radius
+from ai_brain.lazy import LazyTacticalBrain
+
+parser = argparse.ArgumentParser(description="Science Day 2D platformer")
+parser.add_argument("--record", metavar="FILE", help="record every frame's input and the RNG seed to FILE")
+parser.add_argument("--replay", metavar="FILE", help="play back a recorded run frame-for-frame")
+parser.add_argument("--max-fps", type=int, default=144, help="render rate cap (0 = uncapped); the game itself always steps at 60 Hz")
+parser.add_argument("--render-scale", default="auto", help="internal world resolution: 'auto' adapts to frame time, or a fixed factor like 0.5")
+parser.add_argument("--event-log", metavar="DIR", default="logs", help="directory for gameplay event logs ('' to disable)")
+parser.add_argument("--startup-report", metavar="FILE", help="write startup milestones (ms) as JSON once the game is playable")
+parser.add_argument("--frame-budget-ms", type=float, default=1000 / 60, help="frame time the auto render scale tries to hold")
+args = parser.parse_args()
+startup.mark("imports")
 
 pygame.init()
 
@@ -15,232 +38,252 @@ WIDTH, HEIGHT = info.current_w, info.current_h
 screen = pygame.display.set_mode((WIDTH, HEIGHT), pygame.FULLSCREEN)
 clock = pygame.time.Clock()
 font = pygame.font.SysFont("Arial", 20, bold=True)
-
-FLOOR_Y = HEIGHT - 110
-
-ai_brain = AITacticalBrain(model_name="phi3") 
-
-player = Player(100, FLOOR_Y - 60)
-boss = Boss(4122, FLOOR_Y - 350) 
-earth_boss = EarthBoss(8100, FLOOR_Y - 550)
-dragon_boss = DragonBoss(14080, FLOOR_Y - 700)
+game_over_font = pygame.font.SysFont("Arial", 80, bold=True)
+restart_font = pygame.font.SysFont("Arial", 30, bold=True)
+hud_font = pygame.font.SysFont("Courier New", 16, bold=True)
+text_cache = TextCache()
+startup.mark("display")
+
+replay = Replay.load(args.replay) if args.replay else None
+if replay or args.record:
+    # LLM replies arrive at wall-clock times, which would make the run unrepeatable
+    print("[SYSTEM] Deterministic run: AI tactician disabled.")
+    ai_brain = None
+else:
+    ai_brain = LazyTacticalBrain(model_name="phi3") # Imported off the startup path
+
+if replay:
+    world = replay.make_world(ai_brain)
+    if (replay.width, replay.height) != (WIDTH, HEIGHT):
+        print(f"[REPLAY] Recorded at {replay.width}x{replay.height}, playing on {WIDTH}x{HEIGHT}.")
+else:
+    world = World(WIDTH, HEIGHT, ai_brain)
+recorder = InputRecorder(world) if args.record else None
+if replay is None and recorder is None:
+    world.history = SnapshotRing(capacity=600) # F5 rewinds through the last 10 seconds (breaks replays, so not there)
+if args.event_log:
+    event_log.open(args.event_log)
+player = world.player
+boss = world.boss
+earth_boss = world.earth_boss
+dragon_boss = world.dragon_boss
+startup.mark("world")
 
 ASSET_DIR = "assets"
 
-try:
-    raw_bg = pygame.image.load(os.path.join(ASSET_DIR, "bg.jpg")).convert()
-    bg_img = pygame.transform.scale(raw_bg, (15000, HEIGHT))
-    player_img = pygame.transform.scale(pygame.image.load(os.path.join(ASSET_DIR, "mc.png")).convert_alpha(), (player.rect.width, player.rect.height))
-    boss_img = pygame.transform.scale(pygame.image.load(os.path.join(ASSET_DIR, "boss.png")).convert_alpha(), (boss.rect.width, boss.rect.height))
-    earth_boss_img = pygame.transform.scale(pygame.image.load(os.path.join(ASSET_DIR, "boss2.png")).convert_alpha(), (earth_boss.rect.width, earth_boss.rect.height))
-    dragon_boss_img = pygame.transform.scale(pygame.image.load(os.path.join(ASSET_DIR, "dragonboss.png")).convert_alpha(), (dragon_boss.rect.width, dragon_boss.rect.height))
-    spike_img = pygame.image.load(os.path.join(ASSET_DIR, "spike.png")).convert_alpha()
-except FileNotFoundError as e:
-    print(f"\n[CRITICAL ERROR] Missing asset file: {e}")
-    print("Ensure you are running the script from the SCIENCE_DAY root directory.")
-    pygame.quit()
-    sys.exit()
-
-platforms = [
-    pygame.Rect(0, FLOOR_Y, 649, 150), 
-    pygame.Rect(805, FLOOR_Y, 327, 150),     
-    pygame.Rect(1300, FLOOR_Y, 958, 150),    
-    pygame.Rect(2426, FLOOR_Y, 650, 150),    
-    pygame.Rect(3173, FLOOR_Y, 1564, 150),
-    pygame.Rect(4857, 652, 4216, 150),
-    pygame.Rect(7802, 455, 120, 50),
-    pygame.Rect(7989, 383, 120, 50),
-    pygame.Rect(7886, 229, 120, 50),
-    pygame.Rect(9157, 500, 321, 150),
-    pygame.Rect(9518, 690, 120, 50),
-    pygame.Rect(9687, 565, 120, 50),
-    pygame.Rect(9853, 501, 398, 150),
-    pygame.Rect(10357, 596, 218, 150),
-    pygame.Rect(10687, 639, 400, 150),
-    pygame.Rect(11219, 526, 796, 150),
-    pygame.Rect(12128, 530, 410, 150),
-    pygame.Rect(12628, 317, 183, 50),
-    pygame.Rect(12923, 528, 657, 150),
-    pygame.Rect(13584, 379, 180, 50),
-    pygame.Rect(13845, 475, 180, 50),
-    pygame.Rect(13664, 636, 180, 50),
-    pygame.Rect(14061, 618, 940, 150)
-]
-
-spikes = [
-    Spike(4887, 85),
-    Spike(5129, 65),
-    Spike(5364, 50),
-    Spike(5433, 70),
-    Spike(5633, 94),
-    Spike(5942, 70),
-    Spike(6365, 78),
-    Spike(6135, 62),
-    Spike(6642, 49),
-    Spike(6840, 56),
-    Spike(7094, 83),
-    Spike(7415, 68),
-    Spike(7585, 60),
-    Spike(7843, 82),
-    Spike(7642, 79),
-    Spike(8120, 51)
-]
-projectiles = []
-
-player_profile = {
-    "total_jumps": 0,
-    "shots_fired": 0,
-    "shots_hit": 0
+# One atlas per group, loaded in this order. Stage 1 is playable once "stage1" and
+# the backdrop are in; the later bosses keep decoding while the player runs.
+SPRITE_GROUPS = {
+    "stage1": [
+        SpriteSpec("player", "mc.png", player.rect.size, flip=True),
+        SpriteSpec("boss", "boss.png", boss.rect.size, flip=False),
+        SpriteSpec("spike", "spike.png", None, flip=False),
+    ],
+    "earth": [SpriteSpec("earth_boss", "boss2.png", earth_boss.rect.size, flip=False)],
+    "dragon": [SpriteSpec("dragon_boss", "dragonboss.png", dragon_boss.rect.size, flip=False)],
 }
-
-true_scroll = 0
-camera_scroll = 0
-ai_triggered = False 
-
-running = True
+PLAYABLE = (("stage1", 1.0), ("background", 1.0))
+
+def load_background():
+    background = TiledBackground(pygame.image.load(os.path.join(ASSET_DIR, "bg.jpg")), world.level_width, HEIGHT, WIDTH)
+    background.tile(0) # The stage opens on the first tile: scale it here, not on the first frame
+    return background
+
+loader = AssetLoader() # Jobs are keyed (group, render scale)
+loader.add_sprites(("stage1", 1.0), SPRITE_GROUPS["stage1"], (WIDTH, HEIGHT), 1.0, ASSET_DIR)
+loader.add(("background", 1.0), load_background)
+for group in ("earth", "dragon"):
+    loader.add_sprites((group, 1.0), SPRITE_GROUPS[group], (WIDTH, HEIGHT), 1.0, ASSET_DIR)
+
+# --- DYNAMIC RENDER RESOLUTION ---
+if args.render_scale == "auto":
+    resolution = DynamicResolution((WIDTH, HEIGHT), budget_ms=args.frame_budget_ms)
+else:
+    resolution = DynamicResolution((WIDTH, HEIGHT), scales=(float(args.render_scale),))
+views = {}
+background = None
+sprites = {} # Full-scale sprites of every group loaded so far
+loaded_groups = []
+scaled_sprites = {} # Render scale -> its sprites, filled in by the loader
+view_jobs = {}      # Render scale -> loader keys its view waits for
+CHARGE_RADIUS = charge_radius(earth_boss)
+
+def asset_ready(key, result):
+    """Takes in a finished loader job. Groups that arrive late are also queued for scaled views."""
+    global background
+    group, scale = key
+    if group == "background":
+        background = result
+        startup.mark("backdrop ready")
+        return
+    if scale == 1.0:
+        sprites.update(result)
+        loaded_groups.append(group)
+        startup.mark(f"{group} sprites ready")
+        for view_scale in scaled_sprites:
+            loader.add_sprites((group, view_scale), SPRITE_GROUPS[group], (WIDTH, HEIGHT), view_scale, ASSET_DIR)
+    elif scale in scaled_sprites:
+        scaled_sprites[scale].update(result)
+
+def get_view(scale):
+    """
+    Backdrop and sprites pre-scaled for one internal render scale, or None while that
+    scale's sprites are still on the loader. The first request queues them there, so a
+    cold atlas never stalls the frame that asked for a cheaper scale.
+    """
+    view = views.get(scale)
+    if view is None:
+        if scale == 1.0:
+            view_background, images = background, sprites
+        else:
+            if scale not in scaled_sprites:
+                scaled_sprites[scale] = {}
+                view_jobs[scale] = [(group, scale) for group in loaded_groups]
+                for group in loaded_groups:
+                    loader.add_sprites((group, scale), SPRITE_GROUPS[group], (WIDTH, HEIGHT), scale, ASSET_DIR)
+            if not loader.ready(*view_jobs[scale]):
+                return None
+            view_background, images = background.scaled(scale), scaled_sprites[scale]
+        # The earth boss's charge tell, drawn once instead of every frame
+        radius = round(CHARGE_RADIUS * scale)
+        glow = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(glow, (255, 255, 0), (radius, radius), radius)
+        images["charge_glow"] = glow.convert_alpha()
+        view = views[scale] = (view_background, images)
+    return view
+
+render_queue = RenderQueue()
+
+def poll_assets():
+    try:
+        for key, result in loader.poll():
+            asset_ready(key, result)
+    except FileNotFoundError as e:
+        print(f"\n[CRITICAL ERROR] Missing asset file: {e}")
+        print("Ensure you are running the script from the SCIENCE_DAY root directory.")
+        pygame.quit()
+        sys.exit()
+
+def run_loading_screen():
+    """Draws a progress bar until stage 1 is playable. Returns False if the player quit meanwhile."""
+    title = text_cache.render(restart_font, "Loading...", (255, 255, 255))
+    bar_width = 400
+    bar_x = (WIDTH - bar_width) // 2
+    bar_y = HEIGHT // 2
+    first_frame = True
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                return False
+        poll_assets()
+        if loader.ready(*PLAYABLE):
+            return True
+        screen.fill((0, 0, 0))
+        screen.blit(title, title.get_rect(midbottom=(WIDTH // 2, bar_y - 10)))
+        pygame.draw.rect(screen, (255, 165, 0), (bar_x, bar_y, int(bar_width * loader.progress), 20))
+        pygame.draw.rect(screen, (255, 255, 255), (bar_x, bar_y, bar_width, 20), 2)
+        pygame.display.flip()
+        if first_frame:
+            startup.mark("loading screen")
+            first_frame = False
+        clock.tick(60)
+
+def read_input(events):
+    """Translates this frame's keyboard state into a FrameInput for the world."""
+    keys = pygame.key.get_pressed()
+    inputs = FrameInput(
+        left=keys[pygame.K_LEFT],
+        right=keys[pygame.K_RIGHT],
+        jump=keys[pygame.K_SPACE],
+        restart=keys[pygame.K_r]
+    )
+    for event in events:
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_f:
+                inputs.fire = True
+            if event.key == pygame.K_SPACE:
+                inputs.jump_pressed = True
+    return inputs
+
+running = run_loading_screen()
 dev_click_text = "DEV: Click anywhere"
+timestep = FixedTimestep()
+shown_scale = 1.0 # Render scale of the last frame drawn
+first_frame = True
+startup_pending = True
+carried = None # Presses read on a frame that ran no simulation step wait for the next one
 while running:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-            
-        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-            running = False
-
-        if event.type == pygame.KEYDOWN and player.hp > 0:
-            if event.key == pygame.K_f:  
-                direction = 15 if player.facing_right else -15
-                projectiles.append(Projectile(player.rect.centerx, player.rect.centery, direction, True, (255, 100, 0)))
-                player_profile["shots_fired"] += 1 
+    frame_start = time.perf_counter()
+    frame_timer.start("frame")
+    with frame_timer.scope("input"):
+        events = pygame.event.get()
+        poll_assets()
+        for event in events:
+            if event.type == pygame.QUIT:
+                running = False
                 
-            if event.key == pygame.K_SPACE and not player.is_jumping:
-                player_profile["total_jumps"] += 1 
-            
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            mouse_x, mouse_y = pygame.mouse.get_pos()
-            world_x = mouse_x + camera_scroll
-            dev_click_text = f"X: {world_x} | Y: {mouse_y}"
-            print(f"[DEV] Map Coordinate -> X: {world_x} | Y: {mouse_y}")
-
-    true_scroll += (player.rect.x - (WIDTH // 2) - true_scroll) / 10
-    camera_scroll = max(0, int(true_scroll))
-
-    if earth_boss.hp <= 0 and not ai_triggered:
-        print("[SYSTEM] Stage 2 Clear. Transmitting Telemetry to AI Brain...")
-        accuracy = 0
-        if player_profile["shots_fired"] > 0:
-            accuracy = round((player_profile["shots_hit"] / player_profile["shots_fired"]) * 100, 2)
-        
-        final_profile = {
-            "jumps": player_profile["total_jumps"],
-            "accuracy_percent": accuracy
-        }
-        
-        ai_brain.request_tactics_async(final_profile, dragon_boss)
-        ai_triggered = True 
-
-    if player.hp > 0:
-        player.move(platforms) 
-    else:
-        player.vel_y += 0.8
-        player.rect.y += player.vel_y    
-
-    if boss.hp > 0:
-        boss.update(player, projectiles) # CORRECTED: Stage 1 Boss Brain Activated
-        
-    if earth_boss.hp > 0:
-        earth_boss.update(player)
-        
-    dragon_boss.update(player, projectiles, spikes)
-
-    if player.hp > 0:
-        for b in [boss, earth_boss, dragon_boss]:
-            if b.hp > 0 and player.rect.colliderect(b.rect):
-                player.hp -= 2 
-                
-                if player.rect.centerx < b.rect.centerx:
-                    player.rect.x -= 30 
-                else:
-                    player.rect.x += 30 
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                running = False
+
+            # --- PROFILING: F3 toggles the timing HUD, F4 dumps the ring buffers ---
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                frame_timer.toggle_overlay()
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                print(f"[PROFILER] Frame timings written to {frame_timer.dump()}")
+
+            # --- DEV: F5 rewinds the world one second ---
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F5 and world.history is not None:
+                snapshot = world.history.rewind(60)
+                if snapshot is not None:
+                    restore(world, snapshot)
+                    print(f"[DEV] Rewound to frame {world.frame} ({len(world.history)} snapshots left)")
                 
-                player.vel_y = -8 
-
-    for proj in projectiles[:]:
-        proj.rect.x += proj.speed
-        if proj.rect.x > player.rect.x + 800 or proj.rect.x < player.rect.x - 800:
-            projectiles.remove(proj)
-            continue
-            
-        if proj.is_player:
-            if boss.hp > 0 and proj.rect.colliderect(boss.rect):
-                boss.hp -= 1  
-                player_profile["shots_hit"] += 1 
-                projectiles.remove(proj)
-            elif earth_boss.hp > 0 and proj.rect.colliderect(earth_boss.rect):
-                earth_boss.hp -= 1
-                player_profile["shots_hit"] += 1 
-                projectiles.remove(proj)
-            elif dragon_boss.hp > 0 and proj.rect.colliderect(dragon_boss.rect):
-                dragon_boss.hp -= 1
-                player_profile["shots_hit"] += 1 
-                projectiles.remove(proj)
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                mouse_x, mouse_y = pygame.mouse.get_pos()
+                world_x = mouse_x + world.camera_scroll
+                dev_click_text = f"X: {world_x} | Y: {mouse_y}"
+                print(f"[DEV] Map Coordinate -> X: {world_x} | Y: {mouse_y}")
+
+        inputs = read_input(events)
+        if carried is not None:
+            inputs.fire = inputs.fire or carried.fire
+            inputs.jump_pressed = inputs.jump_pressed or carried.jump_pressed
+
+    # --- FIXED-RATE SIMULATION ---
+    steps = timestep.advance()
+    for i in range(steps):
+        if replay is None:
+            step_inputs = inputs if i == 0 else inputs.held() # A press fires once, not once per catch-up step
+        elif replay.finished:
+            print(f"[REPLAY] Finished after {len(replay)} frames.")
+            running = False
+            break
         else:
-            if proj.rect.colliderect(player.rect):
-                player.hp -= 10
-                projectiles.remove(proj)
-
-    for spike in spikes[:]:
-        spike.update(player)
-        if spike.rect.y > HEIGHT: 
-            spikes.remove(spike)
-
-    screen.fill((135, 206, 235))
-
-    shake_x = 0
-    shake_y = 0
-    if earth_boss.hp > 0 and hasattr(earth_boss, 'is_charging') and earth_boss.is_charging:
-        shake_x = random.randint(-12, 12) 
-        shake_y = random.randint(-12, 12) 
-
-    # CORRECTED: Dragon Boss Earthquake Camera Link
-    if dragon_boss.hp > 0 and hasattr(dragon_boss, 'is_shaking') and dragon_boss.is_shaking:
-        shake_x = random.randint(-20, 20) 
-        shake_y = random.randint(-20, 20)
-
-    render_scroll_x = camera_scroll + shake_x
-    screen.blit(bg_img, (-render_scroll_x, shake_y)) 
-
-    if not player.facing_right:
-        flipped_player = pygame.transform.flip(player_img, True, False)
-        screen.blit(flipped_player, (player.rect.x - render_scroll_x, player.rect.y + shake_y))
-    else:
-        screen.blit(player_img, (player.rect.x - render_scroll_x, player.rect.y + shake_y))
-
-    if boss.hp > 0:
-        screen.blit(boss_img, (boss.rect.x - render_scroll_x, boss.rect.y + shake_y))
-        
-    if earth_boss.hp > 0:
-        if hasattr(earth_boss, 'is_charging') and earth_boss.is_charging:
-            center_x = earth_boss.rect.centerx - render_scroll_x
-            center_y = earth_boss.rect.centery + shake_y
-            radius = (earth_boss.rect.width // 2) + 30 
-            pygame.draw.circle(screen, (255, 255, 0), (center_x, center_y), radius)
-            
-        screen.blit(earth_boss_img, (earth_boss.rect.x - render_scroll_x, earth_boss.rect.y + shake_y))
-
-    if dragon_boss.hp > 0:
-        screen.blit(dragon_boss_img, (dragon_boss.rect.x - render_scroll_x, dragon_boss.rect.y + shake_y))
-
-    for proj in projectiles:
-        pygame.draw.rect(screen, proj.color, (proj.rect.x - render_scroll_x, proj.rect.y + shake_y, proj.rect.width, proj.rect.height))
-    for spike in spikes:
-        screen.blit(spike_img, (spike.rect.x - render_scroll_x, spike.rect.y + shake_y))
+            step_inputs = replay.next_input()
+
+        if recorder:
+            recorder.record(step_inputs)
+        world.step(step_inputs)
+    carried = inputs if steps == 0 else None
+
+    frame_timer.start("render")
+    # The world goes into a canvas at the current render scale, the HUD onto the screen
+    scale = resolution.scale
+    view = get_view(scale)
+    if view is None:
+        scale = shown_scale # The new scale's sprites are still loading; keep the one we had
+        view = get_view(scale)
+    shown_scale = scale
+    canvas = resolution.canvas(screen, scale)
+    view_background, images = view
+    camera_scroll = draw_world(canvas, render_queue, world, view_background, images, timestep.alpha, scale)
+    resolution.present(screen, canvas)
 
     pygame.draw.rect(screen, (150, 0, 0), (20, 20, 200, 20)) 
     pygame.draw.rect(screen, (0, 255, 0), (20, 20, max(0, player.hp * 2), 20)) 
     pygame.draw.rect(screen, (255, 255, 255), (20, 20, 200, 20), 2)
 
-    ai_text = font.render(f"AI Triggered: {ai_triggered}", True, (255, 255, 255))
+    ai_text = text_cache.render(font, f"AI Triggered: {world.ai_triggered}", (255, 255, 255))
     screen.blit(ai_text, (20, 50))
 
     active_bosses = [
@@ -272,48 +315,69 @@ while running:
                 pygame.draw.rect(screen, (255, 165, 0), (bar_x, bar_y, int(bar_width * hp_percentage), 20))
                 pygame.draw.rect(screen, (255, 255, 255), (bar_x, bar_y, bar_width, 20), 2)
                 
-                boss_text = font.render(name, True, (255, 255, 255))
+                boss_text = text_cache.render(font, name, (255, 255, 255))
                 screen.blit(boss_text, (bar_x, bar_y - 25))
                 
                 bars_drawn += 1
 
     try:
-        dev_text = font.render(dev_click_text, True, (255, 255, 0)) 
+        dev_text = text_cache.render(font, dev_click_text, (255, 255, 0)) 
         screen.blit(dev_text, (20, 80)) 
     except NameError:
         pass 
     
     if player.hp <= 0:
-        game_over_font = pygame.font.SysFont("Arial", 80, bold=True)
-        game_over_text = game_over_font.render("GAME OVER", True, (255, 0, 0))
+        game_over_text = text_cache.render(game_over_font, "GAME OVER", (255, 0, 0))
         text_rect = game_over_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 50))
         screen.blit(game_over_text, text_rect)
         
         # Add a restart prompt
-        restart_font = pygame.font.SysFont("Arial", 30, bold=True)
-        restart_text = restart_font.render("Press 'R' to Restart", True, (255, 255, 255))
+        restart_text = text_cache.render(restart_font, "Press 'R' to Restart", (255, 255, 255))
         restart_rect = restart_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 50))
         screen.blit(restart_text, restart_rect)
-        
-        # Listen for the restart key inside the main loop
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_r]:
-            # Reset player
-            player.hp = 100
-            player.rect.x = player.spawn_x
-            player.rect.y = player.spawn_y
-            player.vel_y = 0
-            # Reset bosses
-            boss.hp = 30
-            earth_boss.hp = 50
-            dragon_boss.hp = 100
-            # Clear stage
-            projectiles.clear()
-            # Reset AI trigger
-            ai_triggered = False
-
-    pygame.display.flip()
-    clock.tick(60)
+
+    frame_timer.draw_overlay(screen, hud_font, WIDTH - 330, 20)
+    if frame_timer.overlay_visible:
+        queue_text = text_cache.render(hud_font, f"draw calls {render_queue.draw_calls}  sprites {render_queue.submitted - render_queue.culled}/{render_queue.submitted}", (255, 255, 255))
+        screen.blit(queue_text, (WIDTH - 330, 4))
+    frame_timer.stop("render")
+
+    with frame_timer.scope("flip"):
+        pygame.display.flip()
+    frame_timer.stop("frame")
+
+    if first_frame:
+        first_frame = False
+        startup.mark("first frame")
+    if startup_pending and loader.idle:
+        # Every asset is in: report the cold start, then import the AI stack long before Stage 2 needs it
+        startup_pending = False
+        startup.mark("all assets")
+        print("[STARTUP] " + "\n[STARTUP] ".join(startup.report()))
+        if args.startup_report:
+            print(f"[STARTUP] Milestones written to {startup.dump(args.startup_report)}")
+        if ai_brain is not None:
+            ai_brain.warm_up()
+
+    # Frames drawn at a stand-in scale say nothing about the chosen one, so it isn't judged until it shows
+    if scale == resolution.scale and resolution.update((time.perf_counter() - frame_start) * 1000):
+        event_log.log(RENDER_SCALE, "renderer", round(resolution.scale * 100), round(resolution.frame_ms * 100))
+        # Only the new scale and the one just left (the likeliest next switch) keep backdrop tiles
+        for view_scale, (view_background, _) in views.items():
+            if view_scale not in (resolution.scale, scale):
+                view_background.release()
+    clock.tick(args.max_fps)
+
+if recorder:
+    recorder.save(args.record)
+    print(f"[REPLAY] Saved {len(recorder.frames)} frames (seed {world.seed}) to {args.record}")
+
+if ai_brain:
+    ai_brain.close()
+
+event_log.close()
+if event_log.dropped:
+    print(f"[EVENTS] {event_log.dropped} events dropped while the disk was busy")
 
 pygame.quit()
 sys.exit()
\ No newline at end of file
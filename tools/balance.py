@@ -0,0 +1,206 @@
+"""
+Headless boss-balancing runner.
+
+Plays thousands of episodes against one boss (or the whole stage) with scripted or
+random-policy players, fanned out over a process pool, and prints a results table:
+win rate, time-to-kill, damage taken per attack type and simulation speed.
+
+    python -m tools.balance --stage dragon --episodes 2000
+    python -m tools.balance --stage earth --set earth_boss.strike_frame=240
+    python -m tools.balance --stage dragon --tactics projectiles=8,spike_drop=2,earthquake=4
+
+Needs no display: SDL runs on its dummy video driver.
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+from multiprocessing import Pool
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from core.engine import World, FrameInput
+
+# The floor sits at height - 110 while later platforms use absolute y values authored
+# for a 768px-tall screen; at other heights stage 2 can end up out of jump range
+WIDTH, HEIGHT = 1366, 768
+
+# stage -> (boss that has to die to win, player start x or None for the level spawn)
+STAGES = {
+    "boss": ("boss", 3522),
+    "earth": ("earth_boss", 7500),
+    "dragon": ("dragon_boss", 13480),
+    "all": ("dragon_boss", None),
+}
+
+
+# --- POLICIES ---
+# A policy maps (world, rng, frame) to the FrameInput for that frame
+
+def random_policy(world, rng, frame):
+    """Button mashing that leans towards running right and shooting."""
+    return FrameInput(right=rng.random() < 0.8, left=rng.random() < 0.1, jump=rng.random() < 0.1,
+                      jump_pressed=rng.random() < 0.05, fire=rng.random() < 0.2)
+
+
+def has_ground(world, x):
+    """True if a platform at or below the player's feet covers world x."""
+    feet = world.player.rect.bottom
+    return any(p.top >= feet - 1 for p in world.platform_index.query(x, x + 1))
+
+
+def scripted_policy(world, rng, frame):
+    """Runs to the nearest living boss, holds position in front of it and keeps firing."""
+    player = world.player
+    target = None
+    for b in world.bosses:
+        if b.hp > 0 and b.rect.right > player.rect.x:
+            target = b
+            break
+
+    advance = target is None or target.rect.left - player.rect.right > 450
+    # Jump the telegraphed earth slam, and hop every so often to dodge volleys and quakes
+    dodge = world.earth_boss.is_charging or frame % 75 == 74
+    # Jump gaps at the last moment, and never dodge-jump into one
+    gap_ahead = advance and not has_ground(world, player.rect.right + 40)
+    safe_landing = not advance or has_ground(world, player.rect.centerx + 300)
+    jump = (gap_ahead or (dodge and safe_landing)) and not player.is_jumping
+    return FrameInput(right=advance, jump=jump, jump_pressed=jump, fire=frame % 6 == 0)
+
+
+POLICIES = {
+    "scripted": scripted_policy,
+    "random": random_policy,
+}
+
+
+# --- EPISODES ---
+
+def parse_overrides(pairs):
+    """['earth_boss.strike_frame=240', ...] -> [('earth_boss', 'strike_frame', 240), ...]"""
+    overrides = []
+    for pair in pairs:
+        name, value = pair.split("=", 1)
+        owner, attr = name.split(".", 1)
+        overrides.append((owner, attr, int(value)))
+    return overrides
+
+
+def parse_tactics(text):
+    """'projectiles=8,spike_drop=2,earthquake=4' -> dict"""
+    return {key: int(value) for key, value in (item.split("=", 1) for item in text.split(","))}
+
+
+def make_world(seed, stage, overrides, tactics):
+    world = World(WIDTH, HEIGHT, seed=seed)
+    _, start_x = STAGES[stage]
+    if start_x is not None:
+        player = world.player
+        player.rect.x = player.spawn_x = start_x
+        player.rect.y = player.spawn_y = 0
+        world.true_scroll = start_x - WIDTH // 2
+        world.camera_scroll = max(0, int(world.true_scroll))
+        world.stream_level()
+    for owner, attr, value in overrides:
+        setattr(getattr(world, owner), attr, value)
+    if tactics is not None:
+        world.dragon_boss.update_tactics(dict(tactics))
+        world.ai_triggered = True # Pinned weights: keep the tactics table from replacing them
+    return world
+
+
+def run_episode(job):
+    """Plays one episode to a win, a death or the frame limit. Runs in a worker process."""
+    seed, stage, policy_name, max_frames, overrides, tactics = job
+    world = make_world(seed, stage, overrides, tactics)
+    target = getattr(world, STAGES[stage][0])
+    policy = POLICIES[policy_name]
+    rng = random.Random(seed ^ 0x5EED) # Separate stream so the policy never shifts the world's rolls
+    player = world.player
+
+    start = time.perf_counter()
+    while world.frame < max_frames and player.hp > 0 and target.hp > 0:
+        world.step(policy(world, rng, world.frame))
+    elapsed = time.perf_counter() - start
+    world.level.close()
+
+    return {
+        "policy": policy_name,
+        "win": target.hp <= 0,
+        "died": player.hp <= 0,
+        "frames": world.frame,
+        "damage": dict(player.damage_taken),
+        "elapsed": elapsed,
+    }
+
+
+# --- REPORT ---
+
+def summarize(results, wall_time):
+    rows = []
+    sources = sorted({source for r in results for source in r["damage"]})
+    for policy in sorted({r["policy"] for r in results}):
+        runs = [r for r in results if r["policy"] == policy]
+        kills = [r["frames"] / 60 for r in runs if r["win"]]
+        frames = sum(r["frames"] for r in runs)
+        row = {
+            "policy": policy,
+            "episodes": len(runs),
+            "win %": 100 * len(kills) / len(runs),
+            "died %": 100 * sum(r["died"] for r in runs) / len(runs),
+            "ttk p50 s": statistics.median(kills) if kills else None,
+            "ttk p90 s": statistics.quantiles(kills, n=10)[-1] if len(kills) > 1 else None,
+            "fps/core": frames / max(sum(r["elapsed"] for r in runs), 1e-9),
+        }
+        for source in sources:
+            row[source] = sum(r["damage"].get(source, 0) for r in runs) / len(runs)
+        rows.append(row)
+
+    columns = list(rows[0])
+    print("Damage columns are mean hp lost per episode")
+    print(" ".join(f"{c:>12}" for c in columns))
+    for row in rows:
+        cells = []
+        for c in columns:
+            value = row[c]
+            if value is None:
+                cells.append(f"{'-':>12}")
+            elif isinstance(value, float):
+                cells.append(f"{value:>12.1f}")
+            else:
+                cells.append(f"{value:>12}")
+        print(" ".join(cells))
+
+    total_frames = sum(r["frames"] for r in results)
+    print(f"{len(results)} episodes, {total_frames} frames in {wall_time:.1f}s "
+          f"({total_frames / max(wall_time, 1e-9):.0f} frames/s across all workers)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless boss balancing runs.")
+    parser.add_argument("--stage", choices=sorted(STAGES), default="all")
+    parser.add_argument("--policy", choices=sorted(POLICIES) + ["both"], default="both")
+    parser.add_argument("--episodes", type=int, default=1000, help="Per policy")
+    parser.add_argument("--max-frames", type=int, default=60 * 60 * 3)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--set", action="append", default=[], metavar="OWNER.ATTR=INT",
+                        help="Override a boss attribute, e.g. boss.high_volley_frame=100")
+    parser.add_argument("--tactics", help="Dragon weights, e.g. projectiles=8,spike_drop=2,earthquake=4")
+    args = parser.parse_args()
+
+    policies = sorted(POLICIES) if args.policy == "both" else [args.policy]
+    overrides = parse_overrides(args.set)
+    tactics = parse_tactics(args.tactics) if args.tactics else None
+    jobs = [(args.seed + i, args.stage, policy, args.max_frames, overrides, tactics)
+            for policy in policies for i in range(args.episodes)]
+
+    start = time.perf_counter()
+    with Pool(args.workers) as pool:
+        results = list(pool.imap_unordered(run_episode, jobs, chunksize=max(1, len(jobs) // (args.workers * 8))))
+    summarize(results, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
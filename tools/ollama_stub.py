@@ -0,0 +1,203 @@
+"""
+Stand-in for a local Ollama server's /api/generate, for exercising the AI brain
+without a model: latency drawn from a distribution, streamed or one-shot replies,
+and a configurable share of failures.
+
+Failure kinds, each with its own rate:
+    error       HTTP 500 with an Ollama-style {"error": ...} body
+    truncated   the JSON object stops halfway (the model hit its token limit)
+    wrong_keys  "fire_blast" instead of "projectiles", as the prompt's own wording invites
+    prose       a {braced aside} ahead of the real object, which a first-{...}-match parser grabs
+    nested      the weights wrapped in an outer object
+
+    python -m tools.ollama_stub --latency lognormal:400,0.6 --error-rate 0.05 --truncated-rate 0.1
+"""
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FAILURES = ("error", "truncated", "wrong_keys", "prose", "nested")
+
+
+def parse_latency(text):
+    """'fixed:MS', 'uniform:LO,HI' or 'lognormal:MEDIAN,SIGMA' (ms) -> function(rng) -> seconds."""
+    kind, _, params = text.partition(":")
+    values = [float(v) for v in params.split(",")] if params else []
+    if kind == "fixed":
+        return lambda rng: values[0] / 1000
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1]) / 1000
+    if kind == "lognormal":
+        mu = math.log(values[0])
+        return lambda rng: rng.lognormvariate(mu, values[1]) / 1000
+    raise ValueError(f"unknown latency distribution {text!r}")
+
+
+class StubConfig:
+    """What the stub answers and how slowly. Rates are probabilities per request."""
+
+    def __init__(self, latency="fixed:200", token_ms=5.0, rates=None, seed=None):
+        self.latency_spec = latency
+        self.latency = parse_latency(latency) # Time to first token: model load + prompt evaluation
+        self.token_ms = token_ms              # Gap between streamed tokens
+        self.rates = dict.fromkeys(FAILURES, 0.0)
+        self.rates.update(rates or {})
+        self.seed = seed
+
+    def pick(self, rng):
+        roll = rng.random()
+        for kind in FAILURES:
+            roll -= self.rates[kind]
+            if roll < 0:
+                return kind
+        return "ok"
+
+
+def reply_text(outcome, rng):
+    """The model's raw text for one outcome."""
+    weights = [rng.randint(1, 10) for _ in range(3)]
+    tactics = json.dumps(dict(zip(("projectiles", "spike_drop", "earthquake"), weights)))
+    if outcome == "truncated":
+        return "Here you go: " + tactics[:rng.randint(2, len(tactics) - 2)]
+    if outcome == "wrong_keys":
+        return json.dumps(dict(zip(("fire_blast", "spike_drop", "earthquake"), weights)))
+    if outcome == "prose":
+        return "Thinking {about the player's accuracy} first. Answer: " + tactics
+    if outcome == "nested":
+        return '{"tactics": ' + tactics + "}"
+    return " " + tactics + "\n"
+
+
+def tokens(text, rng):
+    """Splits text into 1-4 character pieces, roughly how a model streams."""
+    pieces = []
+    i = 0
+    while i < len(text):
+        step = rng.randint(1, 4)
+        pieces.append(text[i:i + step])
+        i += step
+    return pieces
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # Keep-alive, and chunked streaming like the real server
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        stub = self.server.stub
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path != "/api/generate":
+            self.send_error(404)
+            return
+        request = json.loads(body or b"{}")
+        with stub.lock:
+            rng = random.Random(stub.rng.random())
+            outcome = stub.config.pick(rng)
+            stub.counts[outcome] += 1
+        model = request.get("model", "stub")
+        time.sleep(stub.config.latency(rng))
+
+        if outcome == "error":
+            payload = json.dumps({"error": "stub: model runner crashed"}).encode()
+            self.send_response(500)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+
+        pieces = tokens(reply_text(outcome, rng), rng)
+        if not request.get("stream", True): # Ollama streams unless told not to
+            time.sleep(stub.config.token_ms * len(pieces) / 1000)
+            payload = json.dumps({"model": model, "response": "".join(pieces), "done": True}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for piece in pieces:
+                self._chunk({"model": model, "response": piece, "done": False})
+                time.sleep(stub.config.token_ms / 1000)
+            self._chunk({"model": model, "response": "", "done": True})
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True # The client stopped reading once it had its JSON
+
+    def _chunk(self, message):
+        line = json.dumps(message).encode() + b"\n"
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+        self.wfile.flush()
+
+
+class OllamaStub:
+    """The stub server on a background thread. Port 0 picks a free port."""
+
+    def __init__(self, config, host="127.0.0.1", port=11434):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.lock = threading.Lock()
+        self.counts = Counter() # outcome -> requests answered that way
+        self.server = ThreadingHTTPServer((host, port), _Handler)
+        self.server.daemon_threads = True
+        self.server.stub = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/api/generate"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True, name="ollama-stub")
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def serve(config, host="127.0.0.1", port=11434, ready=None):
+    """Runs a stub in the foreground, e.g. in its own process. `ready` (an Event) is set once it listens."""
+    stub = OllamaStub(config, host, port)
+    if ready is not None:
+        ready.set()
+    stub.server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for Ollama's /api/generate")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--latency", default="lognormal:400,0.6", help="fixed:MS, uniform:LO,HI or lognormal:MEDIAN,SIGMA")
+    parser.add_argument("--token-ms", type=float, default=5.0, help="delay between streamed tokens")
+    parser.add_argument("--seed", type=int)
+    for kind in FAILURES:
+        parser.add_argument(f"--{kind.replace('_', '-')}-rate", type=float, default=0.0, metavar="P")
+    args = parser.parse_args()
+
+    rates = {kind: getattr(args, f"{kind}_rate") for kind in FAILURES}
+    config = StubConfig(args.latency, args.token_ms, rates, args.seed)
+    print(f"[STUB] Serving /api/generate on http://{args.host}:{args.port} ({args.latency}, rates {rates})")
+    try:
+        serve(config, args.host, args.port)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()